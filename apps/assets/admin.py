@@ -12,7 +12,8 @@ from apps.assets.models import (
     SoftwareCategory,
     SoftwareLicences,
     LicenseHistory,
-    LicenseCheckout
+    LicenseCheckout,
+    MediaBlob,
 )
 # Register your models here.
 
@@ -95,3 +96,9 @@ class LicenseCheckoutAdmin(admin.ModelAdmin):
 
 
 
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = tuple(field.name for field in MediaBlob._meta.fields)
+    search_fields = ["name", "sha256"]
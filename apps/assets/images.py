@@ -0,0 +1,69 @@
+"""
+Resized renditions of ``Asset.image``.
+
+Uploads are stored as sent. A Celery task then writes every size in
+``RENDITION_SIZES`` in both WebP and JPEG, with the EXIF orientation
+applied, and records their storage names on ``Asset.image_renditions``
+together with the image they were built from.
+"""
+
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Longest edge in pixels; images are never upscaled.
+RENDITION_SIZES = {
+    "thumbnail": 200,
+    "card": 640,
+    "full": 1920,
+}
+
+RENDITION_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+DEFAULT_FORMAT = "webp"
+
+
+def renditions_are_current(asset):
+    return bool(asset.image) and asset.image_renditions.get("source") == asset.image.name
+
+
+def build_renditions(asset):
+    """
+    Write every rendition of ``asset.image`` and return the names mapping.
+    """
+    with asset.image.open("rb") as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGB")
+
+    renditions = {"source": asset.image.name}
+    for size, edge in RENDITION_SIZES.items():
+        resized = image.copy()
+        resized.thumbnail((edge, edge), Image.LANCZOS)
+        renditions[size] = {}
+        for extension, (image_format, options) in RENDITION_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            name = f"assets/renditions/{asset.uid}/{size}.{extension}"
+            if default_storage.exists(name):
+                default_storage.delete(name)
+            renditions[size][extension] = default_storage.save(
+                name, ContentFile(buffer.getvalue())
+            )
+    return renditions
+
+
+def rendition_name(asset, size, image_format=DEFAULT_FORMAT):
+    """
+    Storage name of a rendition, or of the original while none is built yet.
+    """
+    if not asset.image:
+        return None
+    if size in RENDITION_SIZES and renditions_are_current(asset):
+        return asset.image_renditions[size][image_format]
+    return asset.image.name
@@ -0,0 +1,146 @@
+"""
+Bulk import of assets from a CSV upload.
+
+Rows are validated in memory, relations are resolved by name once per file
+and uniqueness of ``serial_no`` and ``tag`` is checked with one query per
+chunk. Each chunk is inserted with ``bulk_create`` in its own transaction,
+so a failing chunk does not roll back the ones before it.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from apps.assets.models import Asset, AssetSupplier
+from apps.assets.registry import asset_categories, statuses
+from apps.assets.search import update_search_vectors
+from apps.assets.serializers import AssetImportRowSerializer
+from apps.assets.transitions import assets_created
+from apps.core.response_cache import invalidate_models
+from apps.core.uploads import read_csv_rows
+
+IMPORT_CHUNK_SIZE = 500
+
+
+class AssetImporter:
+    def __init__(self, upload, chunk_size=IMPORT_CHUNK_SIZE):
+        self.upload = upload
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.errors = []
+        self.suppliers = {}
+        self.seen_serials = set()
+        self.seen_tags = set()
+
+    def add_error(self, line, errors):
+        self.errors.append({"row": line, "errors": errors})
+
+    def run(self):
+        rows = list(read_csv_rows(self.upload))
+
+        supplier_names = {row["supplier"] for _, row in rows if row.get("supplier")}
+        self.suppliers = {
+            supplier.name: supplier
+            for supplier in AssetSupplier.objects.filter(name__in=supplier_names)
+        }
+
+        for start in range(0, len(rows), self.chunk_size):
+            self.import_chunk(rows[start:start + self.chunk_size])
+
+        if self.created:
+            invalidate_models([Asset])
+
+        return {
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+        }
+
+    def build_asset(self, line, row):
+        serializer = AssetImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            self.add_error(line, serializer.errors)
+            return None
+        data = serializer.validated_data
+
+        errors = {}
+        category = asset_categories.by_name(data["category"])
+        if category is None:
+            errors["category"] = ["Asset category does not exist"]
+        asset_status = statuses.by_name(data["status"])
+        if asset_status is None:
+            errors["status"] = ["Asset status does not exist"]
+        supplier = None
+        if data.get("supplier"):
+            supplier = self.suppliers.get(data["supplier"])
+            if supplier is None:
+                errors["supplier"] = ["Asset supplier does not exist"]
+        if errors:
+            self.add_error(line, errors)
+            return None
+
+        return Asset(
+            name=data["name"],
+            serial_no=data["serial_no"],
+            tag=data["tag"],
+            model=data.get("model") or None,
+            condition=data.get("condition") or None,
+            order_number=data.get("order_number") or None,
+            description=data.get("description") or None,
+            purchase_date=data["purchase_date"],
+            purchase_price=data["purchase_price"],
+            requestable=data["requestable"],
+            category_id=category.id,
+            status_id=asset_status.id,
+            supplier=supplier,
+        )
+
+    def import_chunk(self, chunk):
+        candidates = []
+        for line, row in chunk:
+            asset = self.build_asset(line, row)
+            if asset is not None:
+                candidates.append((line, asset))
+        if not candidates:
+            return
+
+        serials = {asset.serial_no for _, asset in candidates}
+        tags = {asset.tag for _, asset in candidates}
+        existing = Asset.objects.filter(Q(serial_no__in=serials) | Q(tag__in=tags))
+        taken_serials = set()
+        taken_tags = set()
+        for serial_no, tag in existing.values_list("serial_no", "tag"):
+            taken_serials.add(serial_no)
+            taken_tags.add(tag)
+
+        assets = []
+        lines = []
+        for line, asset in candidates:
+            errors = {}
+            if asset.serial_no in taken_serials or asset.serial_no in self.seen_serials:
+                errors["serial_no"] = ["Asset with this serial no already exists"]
+            if asset.tag in taken_tags or asset.tag in self.seen_tags:
+                errors["tag"] = ["Asset with this tag already exists"]
+            self.seen_serials.add(asset.serial_no)
+            self.seen_tags.add(asset.tag)
+            if errors:
+                self.add_error(line, errors)
+                continue
+            assets.append(asset)
+            lines.append(line)
+
+        if not assets:
+            return
+
+        try:
+            with transaction.atomic():
+                Asset.objects.bulk_create(assets)
+                asset_ids = [asset.pk for asset in assets]
+                update_search_vectors(Asset.objects.filter(pk__in=asset_ids))
+                assets_created.send(sender=Asset, asset_ids=asset_ids)
+        except IntegrityError as error:
+            # a concurrent writer took a serial or tag after the check above
+            for line in lines:
+                self.add_error(line, {"non_field_errors": [str(error)]})
+            return
+
+        self.created += len(assets)
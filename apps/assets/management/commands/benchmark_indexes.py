@@ -0,0 +1,232 @@
+import importlib
+import re
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, migrations, transaction
+from django.db.migrations.loader import MigrationLoader
+
+from apps.assets.models import (
+    Asset,
+    AssetAssignment,
+    AssetCategory,
+    AssetRequest,
+    AssetReturn,
+    AssetStatus,
+    MaintenanceRequest,
+)
+from apps.core.pagination import KeysetPagination
+from apps.people.models import User
+
+# the migrations whose indexes are compared; without them the tables are back
+# to their plain foreign key indexes
+BENCHMARKED_MIGRATIONS = (
+    ("assets", "0008_ordering_and_event_indexes"),
+    ("people", "0002_created_at_indexes"),
+)
+# the schema the benchmarked indexes are compared against
+EARLIER_MIGRATION = ("assets", "0007_filter_indexes")
+BENCHMARK_USERS = 1000
+PAGE_SIZE = 20
+
+EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway dataset and compare EXPLAIN ANALYZE of the keyset "
+        "pagination queries of the hot list endpoints with and without the "
+        "ordering/event indexes. Everything runs in one transaction that is "
+        "rolled back. PostgreSQL only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Rows seeded into assets and each event table.")
+        parser.add_argument(
+            "--plans", default="benchmark_indexes_plans.txt", help="File the EXPLAIN ANALYZE output is written to."
+        )
+
+    def benchmarked_operations(self):
+        for app_label, name in BENCHMARKED_MIGRATIONS:
+            migration = importlib.import_module(f"apps.{app_label}.migrations.{name}").Migration
+            for operation in migration.operations:
+                yield app_label, operation
+
+    def drop_benchmarked_indexes(self):
+        """
+        Put the indexes back the way they were before the benchmarked
+        migrations: drop theirs and restore the plain foreign key indexes they
+        replaced.
+        """
+        quote = connection.ops.quote_name
+        earlier = MigrationLoader(connection).project_state(EARLIER_MIGRATION)
+        with connection.schema_editor() as schema_editor:
+            for app_label, operation in self.benchmarked_operations():
+                if isinstance(operation, migrations.AddIndex):
+                    schema_editor.execute(f"DROP INDEX IF EXISTS {quote(operation.index.name)}")
+                elif isinstance(operation, migrations.AlterField) and not operation.field.db_index:
+                    model = earlier.apps.get_model(app_label, operation.model_name)
+                    table = model._meta.db_table
+                    column = model._meta.get_field(operation.name).column
+                    schema_editor.execute(
+                        f"CREATE INDEX {quote(f'benchmark_{table}_{column}')} ON {quote(table)} ({quote(column)})"
+                    )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def seed(self, rows):
+        category = AssetCategory.objects.create(name="Benchmark")
+        ready, _ = AssetStatus.objects.get_or_create(name="ready-to-deploy")
+        deployed, _ = AssetStatus.objects.get_or_create(name="deployed")
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            User(
+                username=f"benchmark-{index}",
+                email=f"benchmark-{index}@example.com",
+                employee_no=f"BENCH-{index}",
+                phone=f"bench-{index}",
+                password=password,
+            )
+            for index in range(BENCHMARK_USERS)
+        )
+        user_ids = [user.id for user in users]
+
+        params = {
+            "rows": rows,
+            "category": category.id,
+            "ready": ready.id,
+            "deployed": deployed.id,
+            "users": user_ids,
+            "user_count": len(user_ids),
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Asset._meta.db_table} (
+                    uid, name, serial_no, tag, image_renditions, purchase_date, purchase_price,
+                    category_id, status_id, requestable, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), 'Benchmark ' || i, 'BENCH-SN-' || i, 'BENCH-TAG-' || i, '{{}}',
+                       DATE '2020-01-01' + mod(i, 1500), 100 + mod(i, 5000), %(category)s,
+                       CASE WHEN mod(i, 4) = 0 THEN %(ready)s ELSE %(deployed)s END,
+                       mod(i, 10) = 0, now() - make_interval(secs => i), now()
+                FROM generate_series(1, %(rows)s) AS i
+                """,
+                params,
+            )
+            cursor.execute(
+                f"SELECT min(id), max(id) FROM {Asset._meta.db_table} WHERE category_id = %s",
+                [category.id],
+            )
+            params["first_asset"], params["last_asset"] = cursor.fetchone()
+
+            # spread events over the seeded assets, which one INSERT numbered contiguously
+            asset_id = "%(first_asset)s + mod(i::bigint * 7919, %(rows)s)"
+            user_id = "(%(users)s::bigint[])[1 + mod(i, %(user_count)s)]"
+            for model in (AssetAssignment, AssetReturn):
+                cursor.execute(
+                    f"""
+                    INSERT INTO {model._meta.db_table} (uid, asset_id, user_id, created_at, updated_at)
+                    SELECT gen_random_uuid(), {asset_id}, {user_id}, now() - make_interval(secs => i), now()
+                    FROM generate_series(1, %(rows)s) AS i
+                    """,
+                    params,
+                )
+            cursor.execute(
+                f"""
+                INSERT INTO {AssetRequest._meta.db_table} (
+                    uid, asset_id, user_id, request_date, status, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), {asset_id}, {user_id}, current_date,
+                       CASE WHEN mod(i, 50) = 0 THEN 'pending' ELSE 'approved' END,
+                       now() - make_interval(secs => i), now()
+                FROM generate_series(1, %(rows)s) AS i
+                """,
+                params,
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {MaintenanceRequest._meta.db_table} (
+                    uid, asset_id, user_id, description, status, report_date, updated_at
+                )
+                SELECT gen_random_uuid(), {asset_id}, {user_id}, 'Benchmark', 'completed',
+                       now() - make_interval(secs => i), now()
+                FROM generate_series(1, %(rows)s) AS i
+                """,
+                params,
+            )
+            cursor.execute("ANALYZE")
+
+        return {
+            "asset_id": (params["first_asset"] + params["last_asset"]) // 2,
+            "user_id": user_ids[len(user_ids) // 2],
+            "ready": ready.id,
+        }
+
+    def queries(self, sample):
+        # (queryset, cursor_field) as the list endpoints hand them to the paginator
+        return {
+            "asset list": (Asset.objects.all(), "created_at"),
+            "requestable assets": (Asset.objects.filter(requestable=True, status_id=sample["ready"]), "created_at"),
+            "assignments of an asset": (AssetAssignment.objects.filter(asset_id=sample["asset_id"]), "created_at"),
+            "returns of a user": (AssetReturn.objects.filter(user_id=sample["user_id"]), "created_at"),
+            "requests of a user": (AssetRequest.objects.filter(user_id=sample["user_id"]), "created_at"),
+            "pending requests": (AssetRequest.objects.filter(status="pending"), "created_at"),
+            "maintenance of an asset": (MaintenanceRequest.objects.filter(asset_id=sample["asset_id"]), "report_date"),
+            "maintenance list": (MaintenanceRequest.objects.all(), "report_date"),
+            "user list": (User.objects.all(), "created_at"),
+        }
+
+    def pages(self, queries):
+        """
+        The page queries KeysetPagination runs: the first page, and the page
+        after a cursor halfway through the result.
+        """
+        paginator = KeysetPagination()
+        pages = {}
+        for label, (queryset, cursor_field) in queries.items():
+            paginator.cursor_field = cursor_field
+            ordered = paginator.page_queryset(queryset)
+            pages[(label, "first")] = ordered[: PAGE_SIZE + 1]
+
+            middle = ordered.values_list(cursor_field, "id")[ordered.count() // 2 :][:1]
+            for value, pk in middle:
+                pages[(label, "middle")] = paginator.page_queryset(queryset, (False, value, pk))[: PAGE_SIZE + 1]
+        return pages
+
+    def measure(self, pages):
+        results = {}
+        for key, queryset in pages.items():
+            plan = queryset.explain(analyze=True, buffers=True)
+            match = EXECUTION_TIME.search(plan)
+            results[key] = (float(match.group(1)) if match else None, plan)
+        return results
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The index benchmark needs PostgreSQL.")
+
+        with transaction.atomic():
+            # the seeded rows and the dropped indexes never outlive the benchmark
+            transaction.set_rollback(True)
+
+            self.stdout.write(f"Seeding {options['rows']} rows per table...")
+            sample = self.seed(options["rows"])
+            pages = self.pages(self.queries(sample))
+
+            with_indexes = self.measure(pages)
+            self.drop_benchmarked_indexes()
+            without_indexes = self.measure(pages)
+
+        self.stdout.write(f"{'query':<28}{'page':<8}{'without (ms)':>14}{'with (ms)':>12}")
+        with open(options["plans"], "w") as plans:
+            for label, page in pages:
+                before, before_plan = without_indexes[(label, page)]
+                after, after_plan = with_indexes[(label, page)]
+                self.stdout.write(f"{label:<28}{page:<8}{before:>14.2f}{after:>12.2f}")
+                plans.write(
+                    f"== {label}, {page} page\n{pages[(label, page)].query}\n\n"
+                    f"-- without indexes\n{before_plan}\n\n-- with indexes\n{after_plan}\n\n"
+                )
+        self.stdout.write(f"Plans written to {options['plans']}")
@@ -0,0 +1,102 @@
+import hashlib
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.assets.models import Asset, MediaBlob
+from apps.assets.storage import blob_name, claim_blob, content_addressed_storage
+from apps.assets.tasks import generate_asset_renditions
+from apps.core.response_cache import invalidate_models
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Move asset images into the content-addressed layout, deleting "
+        "duplicate copies and recounting MediaBlob references."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report what would change without touching files or rows.")
+
+    def file_digest(self, path):
+        sha256 = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def repoint_assets(self, old_name, new_name):
+        # the bytes are unchanged, so renditions built from the old name stay valid
+        for asset in Asset.objects.filter(image=old_name).only("id", "image", "image_renditions"):
+            renditions = asset.image_renditions
+            current = renditions.get("source") == old_name
+            if current:
+                renditions = {**renditions, "source": new_name}
+            Asset.objects.filter(id=asset.id).update(
+                image=new_name, image_renditions=renditions, updated_at=timezone.now()
+            )
+            if not current:
+                asset_id = asset.id
+                transaction.on_commit(lambda: generate_asset_renditions.delay(asset_id))
+        invalidate_models([Asset])
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        storage = content_addressed_storage
+        upload_to = Asset._meta.get_field("image").upload_to.rstrip("/")
+        root = storage.path(upload_to)
+
+        moved = removed = freed = 0
+        if os.path.isdir(root):
+            # only the flat upload directory; hashed files live in subdirectories
+            for entry in sorted(os.scandir(root), key=lambda entry: entry.name):
+                if not entry.is_file() or entry.name.endswith(".upload"):
+                    continue
+                old_name = f"{upload_to}/{entry.name}"
+                digest = self.file_digest(entry.path)
+                size = entry.stat().st_size
+
+                if dry_run:
+                    new_name = blob_name(old_name, digest)
+                    duplicate = os.path.exists(storage.path(new_name))
+                    self.stdout.write(f"{old_name} -> {new_name}{' (duplicate)' if duplicate else ''}")
+                    continue
+
+                with transaction.atomic():
+                    new_name = claim_blob(old_name, digest, size)
+                    new_path = storage.path(new_name)
+                    duplicate = os.path.exists(new_path)
+                    self.stdout.write(f"{old_name} -> {new_name}{' (duplicate)' if duplicate else ''}")
+
+                    self.repoint_assets(old_name, new_name)
+                    if duplicate:
+                        os.remove(entry.path)
+                        removed += 1
+                        freed += size
+                    else:
+                        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+                        os.replace(entry.path, new_path)
+                        moved += 1
+
+        if dry_run:
+            return
+
+        counts = dict(
+            Asset.objects.exclude(image="").exclude(image__isnull=True)
+            .values_list("image").annotate(total=Count("id")).order_by()
+        )
+        for blob in MediaBlob.objects.all():
+            refcount = counts.get(blob.name, 0)
+            if blob.refcount != refcount:
+                MediaBlob.objects.filter(id=blob.id).update(refcount=refcount)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Moved {moved} files, removed {removed} duplicates ({freed} bytes freed)."
+            )
+        )
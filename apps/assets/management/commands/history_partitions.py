@@ -0,0 +1,34 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.assets.partitions import PARTITIONS_AHEAD, detach_partitions, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly history partitions ahead of time and detach the "
+        "ones older than --detach-before. PostgreSQL only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=PARTITIONS_AHEAD, help="Months to create after the current one.")
+        parser.add_argument("--detach-before", help="Detach partitions of months before this one (YYYY-MM).")
+        parser.add_argument("--drop", action="store_true", help="Drop detached partitions instead of keeping them for archiving.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("History partitions need PostgreSQL.")
+
+        for name in ensure_partitions(ahead=options["ahead"]):
+            self.stdout.write(f"created {name}")
+
+        if options["detach_before"]:
+            try:
+                before = datetime.datetime.strptime(options["detach_before"], "%Y-%m")
+            except ValueError:
+                raise CommandError("--detach-before must look like YYYY-MM")
+            before = before.replace(tzinfo=datetime.timezone.utc)
+            for name in detach_partitions(before, drop=options["drop"]):
+                self.stdout.write(f"{'dropped' if options['drop'] else 'detached'} {name}")
@@ -0,0 +1,184 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("assets", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="current_assignee",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetassignment",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetassignment",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetassignmenthistory",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetassignmenthistory",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.assetcategory"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assethistory",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assethistory",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetrequest",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetrequest",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetreturn",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="assetreturn",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="status",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.assetstatus"
+            ),
+        ),
+        migrations.AddField(
+            model_name="asset",
+            name="supplier",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.assetsupplier",
+            ),
+        ),
+        migrations.AddField(
+            model_name="licensecheckout",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="licensehistory",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="maintenancerequest",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to="assets.asset"
+            ),
+        ),
+        migrations.AddField(
+            model_name="maintenancerequest",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL
+            ),
+        ),
+        migrations.AddField(
+            model_name="softwarelicences",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.softwarecategory",
+            ),
+        ),
+        migrations.AddField(
+            model_name="softwarelicences",
+            name="supplier",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.assetsupplier",
+            ),
+        ),
+        migrations.AddField(
+            model_name="licensehistory",
+            name="licence",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.softwarelicences",
+            ),
+        ),
+        migrations.AddField(
+            model_name="licensecheckout",
+            name="licence",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.softwarelicences",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="image_renditions",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
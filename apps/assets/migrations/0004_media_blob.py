@@ -0,0 +1,54 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:01
+
+import apps.assets.storage
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0003_asset_image_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "uid",
+                    models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("sha256", models.CharField(max_length=64, unique=True)),
+                ("size", models.BigIntegerField()),
+                ("refcount", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Media Blob",
+                "verbose_name_plural": "Media Blobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="asset",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=apps.assets.storage.ContentAddressedStorage(),
+                upload_to="assets/",
+            ),
+        ),
+    ]
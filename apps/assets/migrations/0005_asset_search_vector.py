@@ -0,0 +1,53 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:02
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+from apps.core.operations import AddPostgresIndex, RunPostgresSQL
+
+# Same vector as apps.assets.search.asset_search_vector, for existing rows.
+BACKFILL_SEARCH_VECTOR = """
+UPDATE assets_asset AS asset SET search_vector =
+    setweight(to_tsvector('simple',
+        coalesce(asset.name, '') || ' ' || coalesce(asset.serial_no, '') || ' ' || coalesce(asset.tag, '')
+    ), 'A')
+    || setweight(to_tsvector('simple',
+        coalesce(asset.model, '') || ' '
+        || coalesce((SELECT name FROM assets_assetcategory WHERE id = asset.category_id), '') || ' '
+        || coalesce((SELECT name FROM assets_assetsupplier WHERE id = asset.supplier_id), '') || ' '
+        || coalesce((
+            SELECT concat_ws(' ', username, first_name, last_name)
+            FROM people_user WHERE id = asset.current_assignee_id
+        ), '')
+    ), 'B')
+    || setweight(to_tsvector('simple',
+        coalesce(asset.order_number, '') || ' ' || coalesce(asset.description, '')
+    ), 'C');
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0004_media_blob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="asset",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        AddPostgresIndex(
+            model_name="asset",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="asset_search_vector_gin"
+            ),
+        ),
+        RunPostgresSQL(BACKFILL_SEARCH_VECTOR, migrations.RunSQL.noop),
+    ]
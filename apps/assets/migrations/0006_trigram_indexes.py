@@ -0,0 +1,52 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:03
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.core.operations import AddPostgresIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0005_asset_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddPostgresIndex(
+            model_name="asset",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["serial_no"],
+                name="asset_serial_no_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        AddPostgresIndex(
+            model_name="asset",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["tag"], name="asset_tag_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        AddPostgresIndex(
+            model_name="asset",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["model"], name="asset_model_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        AddPostgresIndex(
+            model_name="assetsupplier",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="supplier_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        AddPostgresIndex(
+            model_name="softwarelicences",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="licence_name_trgm", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
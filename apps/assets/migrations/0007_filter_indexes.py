@@ -0,0 +1,90 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("assets", "0006_trigram_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="asset",
+            index=models.Index(
+                fields=["status", "category", "-created_at", "-id"],
+                name="asset_status_category_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="asset",
+            index=models.Index(
+                fields=["category", "purchase_date"],
+                name="asset_category_purchase_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="asset",
+            index=models.Index(
+                fields=["purchase_date"],
+                name="asset_purchase_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="asset",
+            index=models.Index(
+                fields=["purchase_price"],
+                name="asset_purchase_price_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="assetrequest_status_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                fields=["user", "status"],
+                name="assetrequest_user_status_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                fields=["request_date"],
+                name="assetrequest_date_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="maintenancerequest",
+            index=models.Index(
+                fields=["status", "-report_date", "-id"],
+                name="maintenance_status_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="maintenancerequest",
+            index=models.Index(
+                fields=["user", "status"],
+                name="maintenance_user_status_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="maintenancerequest",
+            index=models.Index(
+                fields=["-report_date", "-id"],
+                name="maintenance_report_date_idx",
+            ),
+        ),
+    ]
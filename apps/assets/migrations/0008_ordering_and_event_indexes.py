@@ -0,0 +1,374 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("assets", "0007_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="asset",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="asset_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="asset",
+            index=models.Index(
+                condition=models.Q(("requestable", True)),
+                fields=["status", "-created_at", "-id"],
+                name="asset_requestable_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetassignment",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assignment_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetassignment",
+            index=models.Index(
+                fields=["asset", "-created_at", "-id"],
+                name="assignment_asset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetassignment",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="assignment_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetassignmenthistory",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assignhistory_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetassignmenthistory",
+            index=models.Index(
+                fields=["asset", "-created_at", "-id"],
+                name="assignhistory_asset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetassignmenthistory",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="assignhistory_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assetcategory",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assetcategory_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assethistory",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assethistory_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assethistory",
+            index=models.Index(
+                fields=["asset", "-created_at", "-id"],
+                name="assethistory_asset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assethistory",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="assethistory_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assetrequest_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                fields=["asset", "-created_at", "-id"],
+                name="assetrequest_asset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="assetrequest_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetrequest",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["-created_at", "-id"],
+                name="assetrequest_pending_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetreturn",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assetreturn_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetreturn",
+            index=models.Index(
+                fields=["asset", "-created_at", "-id"],
+                name="assetreturn_asset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="assetreturn",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="assetreturn_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assetstatus",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="assetstatus_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="assetsupplier",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="supplier_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="licensecheckout",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="checkout_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="licensecheckout",
+            index=models.Index(
+                fields=["licence", "-created_at", "-id"],
+                name="checkout_licence_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="licensecheckout",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="checkout_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="licensehistory",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="licencehistory_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="licensehistory",
+            index=models.Index(
+                fields=["licence", "-created_at", "-id"],
+                name="licencehistory_licence_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="licensehistory",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="licencehistory_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="maintenancerequest",
+            index=models.Index(
+                fields=["asset", "-report_date", "-id"],
+                name="maintenance_asset_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="maintenancerequest",
+            index=models.Index(
+                fields=["user", "-report_date", "-id"],
+                name="maintenance_user_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="mediablob",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="mediablob_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecategory",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="softwarecategory_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarelicences",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="licence_created_idx",
+            ),
+        ),
+        # the composites above lead with these columns and serve their lookups
+        migrations.AlterField(
+            model_name="asset",
+            name="category",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.assetcategory",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="asset",
+            name="status",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.assetstatus",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetassignment",
+            name="asset",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.asset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetassignment",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetassignmenthistory",
+            name="asset",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.asset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetassignmenthistory",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetrequest",
+            name="asset",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.asset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetrequest",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetreturn",
+            name="asset",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.asset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="assetreturn",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="licensecheckout",
+            name="licence",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.softwarelicences",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="licensecheckout",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="maintenancerequest",
+            name="asset",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="assets.asset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="maintenancerequest",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0008_ordering_and_event_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="assethistory",
+            name="action_type",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("assigned", "Assigned"),
+                    ("returned", "Returned"),
+                    ("replaced", "Replaced"),
+                    ("repaired", "Repaired"),
+                    ("sent for repair", "Sent for Repair"),
+                ],
+                max_length=255,
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,123 @@
+from django.db import migrations
+
+from apps.core.operations import RunPostgresSQL
+
+# Rebuild a history table as a monthly range-partitioned table on created_at
+# and move its rows over. The partition key has to be part of every unique
+# constraint, so the primary key becomes (id, created_at) and uid is unique
+# per (uid, created_at); id keeps coming from one sequence. Constraints and
+# indexes are added once the old table, which still holds their names, is gone.
+PARTITION_TABLE = """
+ALTER TABLE "{table}" RENAME TO "{table}_unpartitioned";
+
+CREATE TABLE "{table}" (
+    "id" bigint NOT NULL,
+    "uid" uuid NOT NULL,
+    "action_type" varchar(255) NULL,
+    "created_at" timestamp with time zone NOT NULL,
+    "{subject}_id" bigint NOT NULL,
+    "user_id" bigint NOT NULL
+) PARTITION BY RANGE ("created_at");
+
+DO $$
+DECLARE
+    partition_start timestamptz;
+BEGIN
+    partition_start := date_trunc('month', coalesce(
+        (SELECT min("created_at") FROM "{table}_unpartitioned"), now()
+    ) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC';
+    -- the current month and the three after it, see apps.assets.partitions
+    WHILE partition_start < (date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC') + interval '4 months' LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF "{table}" FOR VALUES FROM (%L) TO (%L)',
+            '{table}_p' || to_char(partition_start AT TIME ZONE 'UTC', 'YYYYMM'),
+            partition_start,
+            partition_start + interval '1 month'
+        );
+        partition_start := partition_start + interval '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO "{table}" ("id", "uid", "action_type", "created_at", "{subject}_id", "user_id")
+SELECT "id", "uid", "action_type", "created_at", "{subject}_id", "user_id"
+FROM "{table}_unpartitioned";
+
+DROP TABLE "{table}_unpartitioned";
+
+ALTER TABLE "{table}" ADD PRIMARY KEY ("id", "created_at");
+ALTER TABLE "{table}" ADD UNIQUE ("uid", "created_at");
+
+CREATE SEQUENCE "{table}_id_seq" OWNED BY "{table}"."id";
+SELECT setval('"{table}_id_seq"', coalesce(max("id"), 0) + 1, false) FROM "{table}";
+ALTER TABLE "{table}" ALTER COLUMN "id" SET DEFAULT nextval('"{table}_id_seq"');
+
+ALTER TABLE "{table}" ADD CONSTRAINT "{subject_fk}"
+    FOREIGN KEY ("{subject}_id") REFERENCES "{subject_table}" ("id") DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE "{table}" ADD CONSTRAINT "{user_fk}"
+    FOREIGN KEY ("user_id") REFERENCES "people_user" ("id") DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX "{prefix}_created_idx" ON "{table}" ("created_at" DESC, "id" DESC);
+CREATE INDEX "{prefix}_{subject}_idx" ON "{table}" ("{subject}_id", "created_at" DESC, "id" DESC);
+CREATE INDEX "{prefix}_user_idx" ON "{table}" ("user_id", "created_at" DESC, "id" DESC);
+"""
+
+UNPARTITION_TABLE = """
+CREATE TABLE "{table}_plain" (
+    "id" bigint NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    "uid" uuid NOT NULL UNIQUE,
+    "action_type" varchar(255) NULL,
+    "created_at" timestamp with time zone NOT NULL,
+    "{subject}_id" bigint NOT NULL,
+    "user_id" bigint NOT NULL
+);
+INSERT INTO "{table}_plain" ("id", "uid", "action_type", "created_at", "{subject}_id", "user_id")
+SELECT "id", "uid", "action_type", "created_at", "{subject}_id", "user_id" FROM "{table}";
+SELECT setval(pg_get_serial_sequence('"{table}_plain"', 'id'), coalesce(max("id"), 0) + 1, false)
+FROM "{table}_plain";
+DROP TABLE "{table}";
+ALTER TABLE "{table}_plain" RENAME TO "{table}";
+
+ALTER TABLE "{table}" ADD CONSTRAINT "{subject_fk}"
+    FOREIGN KEY ("{subject}_id") REFERENCES "{subject_table}" ("id") DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE "{table}" ADD CONSTRAINT "{user_fk}"
+    FOREIGN KEY ("user_id") REFERENCES "people_user" ("id") DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX "{prefix}_created_idx" ON "{table}" ("created_at" DESC, "id" DESC);
+CREATE INDEX "{prefix}_{subject}_idx" ON "{table}" ("{subject}_id", "created_at" DESC, "id" DESC);
+CREATE INDEX "{prefix}_user_idx" ON "{table}" ("user_id", "created_at" DESC, "id" DESC);
+"""
+
+HISTORY_TABLES = [
+    {
+        "table": "assets_assethistory",
+        "prefix": "assethistory",
+        "subject": "asset",
+        "subject_table": "assets_asset",
+        "subject_fk": "assets_assethistory_asset_id_83c6c599_fk_assets_asset_id",
+        "user_fk": "assets_assethistory_user_id_2b776a3b_fk_people_user_id",
+    },
+    {
+        "table": "assets_licensehistory",
+        "prefix": "licencehistory",
+        "subject": "licence",
+        "subject_table": "assets_softwarelicences",
+        "subject_fk": "assets_licensehistor_licence_id_804c52b4_fk_assets_so",
+        "user_fk": "assets_licensehistory_user_id_7bb19360_fk_people_user_id",
+    },
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assets", "0009_asset_history_repair_action"),
+        ("people", "0002_created_at_indexes"),
+    ]
+
+    operations = [
+        RunPostgresSQL(
+            sql=PARTITION_TABLE.format(**table),
+            reverse_sql=UNPARTITION_TABLE.format(**table),
+        )
+        for table in HISTORY_TABLES
+    ]
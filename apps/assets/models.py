@@ -1,8 +1,36 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 import uuid
 from apps.people.models import User
+from apps.assets.storage import content_addressed_storage
 # Create your models here.
 
+class MediaBlob(models.Model):
+    """
+    One stored file of the content-addressed media storage.
+
+    ``refcount`` is the number of rows whose file field points at it; the
+    file is removed when it drops to zero.
+    """
+    uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.BigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Media Blob"
+        verbose_name_plural = "Media Blobs"
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="mediablob_created_idx")]
+
+    def __str__(self):
+        return self.name
+
+
 class AssetSupplier(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     name = models.CharField(max_length=255)
@@ -19,6 +47,10 @@ class AssetSupplier(models.Model):
         verbose_name = "Asset Supplier"
         verbose_name_plural = "Asset Suppliers"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["name"], name="supplier_name_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["-created_at", "-id"], name="supplier_created_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -34,6 +66,7 @@ class AssetCategory(models.Model):
         verbose_name = "Asset Category"
         verbose_name_plural = "Asset Categories"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="assetcategory_created_idx")]
     
 
     def __str__(self):
@@ -67,6 +100,7 @@ class AssetStatus(models.Model):
         verbose_name = "Asset Status"
         verbose_name_plural = "Asset Statuses"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="assetstatus_created_idx")]
 
     def __str__(self):
         return self.name
@@ -76,18 +110,23 @@ class Asset(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(null=True, blank=True)
     serial_no = models.CharField(max_length=255, null=True, blank=True, unique=True)
-    image = models.ImageField(upload_to="assets/", null=True, blank=True)
+    image = models.ImageField(upload_to="assets/", storage=content_addressed_storage, null=True, blank=True)
+    # {"source": <image name>, "<size>": {"webp": <name>, "jpeg": <name>}}, see apps.assets.images
+    image_renditions = models.JSONField(default=dict, blank=True)
     model = models.CharField(max_length=255, null=True, blank=True)
     tag = models.CharField(max_length=255, null=True, blank=True, unique=True)
     purchase_date = models.DateField()
     purchase_price = models.FloatField()
     condition = models.CharField(max_length=255, null=True, blank=True,choices=[("new", "New"), ("used", "Used")])
-    category = models.ForeignKey(AssetCategory, on_delete=models.CASCADE)
-    status = models.ForeignKey(AssetStatus, on_delete=models.CASCADE)
+    # the category and status lookups use the composite indexes in Meta
+    category = models.ForeignKey(AssetCategory, on_delete=models.CASCADE, db_index=False)
+    status = models.ForeignKey(AssetStatus, on_delete=models.CASCADE, db_index=False)
     current_assignee = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     supplier = models.ForeignKey(AssetSupplier, on_delete=models.CASCADE, null=True, blank=True)
     requestable = models.BooleanField(default=True)
     order_number = models.CharField(max_length=255, null=True, blank=True)
+    # maintained by apps.assets.search
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -95,6 +134,18 @@ class Asset(models.Model):
         verbose_name = "Asset"
         verbose_name_plural = "Assets"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="asset_search_vector_gin"),
+            GinIndex(fields=["serial_no"], name="asset_serial_no_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["tag"], name="asset_tag_trgm", opclasses=["gin_trgm_ops"]),
+            GinIndex(fields=["model"], name="asset_model_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["status", "category", "-created_at", "-id"], name="asset_status_category_idx"),
+            models.Index(fields=["category", "purchase_date"], name="asset_category_purchase_idx"),
+            models.Index(fields=["purchase_date"], name="asset_purchase_date_idx"),
+            models.Index(fields=["purchase_price"], name="asset_purchase_price_idx"),
+            models.Index(fields=["-created_at", "-id"], name="asset_created_idx"),
+            models.Index(fields=["status", "-created_at", "-id"], condition=models.Q(requestable=True), name="asset_requestable_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -102,8 +153,9 @@ class Asset(models.Model):
 
 class AssetAssignment(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
-    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # led by the composite indexes in Meta, which also serve the FK lookups
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     approved_by = models.CharField(max_length=255, null=True, blank=True)
     #status = models.ForeignKey(AssetStatus, on_delete=models.CASCADE)
     #assigned_at = models.DateField() 
@@ -114,6 +166,11 @@ class AssetAssignment(models.Model):
         verbose_name = "Asset Assignment"
         verbose_name_plural = "Asset Assignments"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="assignment_created_idx"),
+            models.Index(fields=["asset", "-created_at", "-id"], name="assignment_asset_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="assignment_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} assigned to {self.user.username}"
@@ -121,8 +178,9 @@ class AssetAssignment(models.Model):
 
 class AssetReturn(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
-    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # led by the composite indexes in Meta, which also serve the FK lookups
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     #returned_at = models.DateField() 
     comment = models.TextField(null=True, blank=True)
     #status = models.ForeignKey(AssetStatus, on_delete=models.CASCADE)
@@ -134,6 +192,11 @@ class AssetReturn(models.Model):
         verbose_name = "Asset Return"
         verbose_name_plural = "Asset Returns"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="assetreturn_created_idx"),
+            models.Index(fields=["asset", "-created_at", "-id"], name="assetreturn_asset_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="assetreturn_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} returned by {self.user.username}"
@@ -141,8 +204,9 @@ class AssetReturn(models.Model):
 
 class AssetRequest(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
-    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # led by the composite indexes in Meta, which also serve the FK lookups
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     request_date = models.DateField() 
     status = models.CharField(max_length=255, null=True, blank=True,choices=[("pending", "Pending"), ("approved", "Approved"), ("rejected", "Rejected")],default="pending")
     comment = models.TextField(null=True, blank=True)
@@ -155,6 +219,15 @@ class AssetRequest(models.Model):
         verbose_name = "Asset Request"
         verbose_name_plural = "Asset Requests"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "-created_at", "-id"], name="assetrequest_status_idx"),
+            models.Index(fields=["user", "status"], name="assetrequest_user_status_idx"),
+            models.Index(fields=["request_date"], name="assetrequest_date_idx"),
+            models.Index(fields=["-created_at", "-id"], name="assetrequest_created_idx"),
+            models.Index(fields=["asset", "-created_at", "-id"], name="assetrequest_asset_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="assetrequest_user_idx"),
+            models.Index(fields=["-created_at", "-id"], condition=models.Q(status="pending"), name="assetrequest_pending_idx"),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} requested by {self.user.username}"
@@ -163,8 +236,9 @@ class AssetRequest(models.Model):
 
 class MaintenanceRequest(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
-    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # led by the composite indexes in Meta, which also serve the FK lookups
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     description = models.TextField()
     report_date = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=255,null=True,blank=True,choices=[("pending", "Pending"), ("completed", "Completed"),("in-progress", "In Progress")],default="pending")
@@ -174,25 +248,37 @@ class MaintenanceRequest(models.Model):
         verbose_name = "Maintenance Request"
         verbose_name_plural = "Maintenance Requests"
         ordering = ["-report_date"]
+        indexes = [
+            models.Index(fields=["status", "-report_date", "-id"], name="maintenance_status_idx"),
+            models.Index(fields=["user", "status"], name="maintenance_user_status_idx"),
+            models.Index(fields=["-report_date", "-id"], name="maintenance_report_date_idx"),
+            models.Index(fields=["asset", "-report_date", "-id"], name="maintenance_asset_idx"),
+            models.Index(fields=["user", "-report_date", "-id"], name="maintenance_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} maintenance requested by {self.user.username}"
     
 
 """
-write a signal that listens for a post_save event on asset and add history
+written by apps.assets.history from the asset transition signal
 """
 class AssetHistory(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    action_type = models.CharField(max_length=255, null=True, blank=True,choices=[("assigned", "Assigned"), ("returned", "Returned"), ("replaced", "Replaced"),("repaired", "Repaired")])
+    action_type = models.CharField(max_length=255, null=True, blank=True,choices=[("assigned", "Assigned"), ("returned", "Returned"), ("replaced", "Replaced"),("repaired", "Repaired"),("sent for repair", "Sent for Repair")])
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         verbose_name = "Asset History"
         verbose_name_plural = "Asset Histories"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="assethistory_created_idx"),
+            models.Index(fields=["asset", "-created_at", "-id"], name="assethistory_asset_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="assethistory_user_idx"),
+        ]
 
 
     def __str__(self):
@@ -201,8 +287,9 @@ class AssetHistory(models.Model):
 
 class AssetAssignmentHistory(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
-    asset = models.ForeignKey(Asset, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # led by the composite indexes in Meta, which also serve the FK lookups
+    asset = models.ForeignKey(Asset, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     action_type = models.CharField(max_length=255, null=True, blank=True,choices=[("assigned", "Assigned"), ("returned", "Returned"), ("replaced", "Replaced"),("repaired", "Repaired")])
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -210,6 +297,11 @@ class AssetAssignmentHistory(models.Model):
         verbose_name = "Asset Assignment History"
         verbose_name_plural = "Asset Assignment Histories"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="assignhistory_created_idx"),
+            models.Index(fields=["asset", "-created_at", "-id"], name="assignhistory_asset_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="assignhistory_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.asset.name} assignment history"
@@ -232,6 +324,7 @@ class SoftwareCategory(models.Model):
         verbose_name = "Software Category"
         verbose_name_plural = "Software Categories"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="softwarecategory_created_idx")]
 
     def __str__(self):
         return self.name
@@ -264,6 +357,10 @@ class SoftwareLicences(models.Model):
         verbose_name = "Software Licences"
         verbose_name_plural = "Software Licences"
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["name"], name="licence_name_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["-created_at", "-id"], name="licence_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.product_key}"
@@ -271,8 +368,9 @@ class SoftwareLicences(models.Model):
 
 class LicenseCheckout(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
-    licence = models.ForeignKey(SoftwareLicences, on_delete=models.CASCADE)
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    # led by the composite indexes in Meta, which also serve the FK lookups
+    licence = models.ForeignKey(SoftwareLicences, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     checkout_date = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -281,13 +379,18 @@ class LicenseCheckout(models.Model):
         verbose_name = "License Checkout"
         verbose_name_plural = "License Checkouts"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="checkout_created_idx"),
+            models.Index(fields=["licence", "-created_at", "-id"], name="checkout_licence_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="checkout_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.licence.name} - {self.user.username}"
     
 
 """
-prepare a signal that listens for a post_save event on lisence and add history
+written by apps.assets.history when licences are checked out and returned
 """
 class LicenseHistory(models.Model):
     uid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -300,6 +403,11 @@ class LicenseHistory(models.Model):
         verbose_name = "Licence History"
         verbose_name_plural = "Licence Histories"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="licencehistory_created_idx"),
+            models.Index(fields=["licence", "-created_at", "-id"], name="licencehistory_licence_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="licencehistory_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.licence.name} history"
@@ -0,0 +1,132 @@
+"""
+Monthly range partitions of the history tables.
+
+On PostgreSQL, AssetHistory and LicenseHistory are partitioned by
+``created_at``, one partition per UTC month. Partitions are created ahead
+of time by ``ensure_partitions``. There is deliberately no default
+partition: it would stop ``detach_partitions`` from detaching old months
+concurrently, without locking the partitions that are being written to.
+On other databases the tables are plain and both functions do nothing.
+"""
+
+import datetime
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.assets.models import AssetHistory, LicenseHistory
+
+PARTITIONED_MODELS = (AssetHistory, LicenseHistory)
+PARTITIONS_AHEAD = 3
+
+
+def month_start(moment):
+    moment = moment.astimezone(datetime.timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def existing_partitions(cursor, table):
+    """
+    Map the name of every partition of ``table`` to the month it holds.
+    """
+    cursor.execute(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = %s
+        """,
+        [table],
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        suffix = name.rpartition("_p")[2]
+        month = datetime.datetime.strptime(suffix, "%Y%m").replace(tzinfo=datetime.timezone.utc)
+        partitions[name] = month
+    return partitions
+
+
+def is_partitioned(cursor, table):
+    cursor.execute(
+        """
+        SELECT 1
+        FROM pg_partitioned_table
+        JOIN pg_class ON pg_class.oid = pg_partitioned_table.partrelid
+        WHERE pg_class.relname = %s
+        """,
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def ensure_partitions(ahead=PARTITIONS_AHEAD, now=None, using=DEFAULT_DB_ALIAS):
+    """
+    Create the partitions of the current month and ``ahead`` months after it.
+
+    Runs after every ``migrate`` and nightly from Celery beat. Tables that
+    are not partitioned (yet) are skipped.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+
+    current = month_start(now or datetime.datetime.now(datetime.timezone.utc))
+    created = []
+    with connection.cursor() as cursor:
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if not is_partitioned(cursor, table):
+                continue
+            existing = existing_partitions(cursor, table)
+            for offset in range(ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(table, month)
+                if name in existing:
+                    continue
+                cursor.execute(
+                    f"CREATE TABLE {connection.ops.quote_name(name)} "
+                    f"PARTITION OF {connection.ops.quote_name(table)} "
+                    "FOR VALUES FROM (%s) TO (%s)",
+                    [month, add_months(month, 1)],
+                )
+                created.append(name)
+    return created
+
+
+def detach_partitions(before, drop=False, using=DEFAULT_DB_ALIAS):
+    """
+    Detach the partitions of the months before ``before``.
+
+    ``DETACH ... CONCURRENTLY`` cannot run in a transaction, so this must be
+    called in autocommit mode. Detached tables are kept for archiving unless
+    ``drop`` is set.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return []
+
+    cutoff = month_start(before)
+    detached = []
+    with connection.cursor() as cursor:
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            for name, month in sorted(existing_partitions(cursor, table).items()):
+                if month >= cutoff:
+                    continue
+                cursor.execute(
+                    f"ALTER TABLE {connection.ops.quote_name(table)} "
+                    f"DETACH PARTITION {connection.ops.quote_name(name)} CONCURRENTLY"
+                )
+                if drop:
+                    cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+                detached.append(name)
+    return detached
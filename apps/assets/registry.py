@@ -0,0 +1,122 @@
+"""
+In-process registry of the small reference tables.
+
+AssetStatus, AssetCategory and SoftwareCategory hold a handful of rows that
+are read on nearly every request and rarely written. Each process keeps a
+snapshot of them in memory, tagged with a version token stored in the shared
+(Redis) cache. Writes replace the token, and every process reloads its
+snapshot the next time it sees a token it does not hold. A lookup that
+misses checks the table before giving up, so a row created by another
+process is found before this one sees the new token.
+
+    from apps.assets.registry import statuses
+
+    deployed = statuses.by_name("deployed")
+"""
+
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+from apps.assets.models import AssetCategory, AssetStatus, SoftwareCategory
+
+# Seconds a process trusts its snapshot before re-reading the version token.
+VERSION_CHECK_INTERVAL = 1.0
+
+
+class ReferenceTable:
+    def __init__(self, model):
+        self.model = model
+        self.version_key = f"registry:{model._meta.label_lower}:version"
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0.0
+
+    def _current_version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def _load(self, version):
+        rows = list(self.model.objects.all())
+        return {
+            "version": version,
+            "id": {row.id: row for row in rows},
+            "uid": {str(row.uid): row for row in rows},
+            "name": {row.name: row for row in rows},
+        }
+
+    def snapshot(self):
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return snapshot
+
+        with self._lock:
+            version = self._current_version()
+            if self._snapshot is None or self._snapshot["version"] != version:
+                self._snapshot = self._load(version)
+            self._checked_at = now
+            return self._snapshot
+
+    def reload(self):
+        with self._lock:
+            self._snapshot = self._load(self._current_version())
+            self._checked_at = time.monotonic()
+            return self._snapshot
+
+    def _get(self, index, key, **lookup):
+        row = self.snapshot()[index].get(key)
+        if row is not None:
+            return row
+        # a row written by another process since our last version check
+        if not self.model.objects.filter(**lookup).exists():
+            return None
+        return self.reload()[index].get(key)
+
+    def by_id(self, pk):
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            return None
+        return self._get("id", pk, id=pk)
+
+    def by_uid(self, uid):
+        try:
+            uid = uuid.UUID(str(uid))
+        except ValueError:
+            return None
+        return self._get("uid", str(uid), uid=uid)
+
+    def by_name(self, name):
+        return self._get("name", name, name=name)
+
+    def all(self):
+        return list(self.snapshot()["id"].values())
+
+    def invalidate(self):
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+        self._checked_at = 0.0
+
+
+statuses = ReferenceTable(AssetStatus)
+asset_categories = ReferenceTable(AssetCategory)
+software_categories = ReferenceTable(SoftwareCategory)
+
+TABLES = {
+    AssetStatus: statuses,
+    AssetCategory: asset_categories,
+    SoftwareCategory: software_categories,
+}
+
+
+def has_status(obj, name):
+    """
+    Whether ``obj.status_id`` points at the status called ``name``.
+    """
+    status = statuses.by_id(obj.status_id)
+    return status is not None and status.name == name
@@ -0,0 +1,134 @@
+"""
+Full-text search over assets.
+
+``Asset.search_vector`` stores a weighted ``tsvector`` of the asset's own
+text columns and the names of its category, supplier and assignee. It is
+refreshed in the database by ``update_search_vectors`` whenever one of
+those rows changes, and queried through its GIN index.
+
+Fuzzy lookups of serials, tags and names use ``pg_trgm`` word similarity
+over ``gin_trgm_ops`` indexes.
+"""
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connection, transaction
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat, Greatest
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from apps.people.models import User
+
+# Serials, tags and names are not natural language, so no stemming.
+SEARCH_CONFIG = "simple"
+
+def related_value(model, expression, ref):
+    return Subquery(
+        model.objects.filter(pk=OuterRef(ref)).order_by().annotate(value=expression).values("value")[:1]
+    )
+
+
+def asset_search_vector():
+    from apps.assets.models import AssetCategory, AssetSupplier
+
+    category = related_value(AssetCategory, F("name"), "category_id")
+    supplier = related_value(AssetSupplier, F("name"), "supplier_id")
+    assignee = related_value(
+        User,
+        Concat("username", Value(" "), "first_name", Value(" "), "last_name"),
+        "current_assignee_id",
+    )
+    return (
+        SearchVector("name", "serial_no", "tag", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("model", category, supplier, assignee, weight="B", config=SEARCH_CONFIG)
+        + SearchVector("order_number", "description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    return queryset.order_by().update(search_vector=asset_search_vector())
+
+
+def search_assets(queryset, text):
+    query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "-created_at")
+    )
+
+
+# Minimum word similarity for a fuzzy match, overridable per request.
+FUZZY_THRESHOLD = 0.3
+
+
+def fuzzy_lookup(queryset, text, fields, threshold=FUZZY_THRESHOLD):
+    """
+    Rows where ``text`` is similar to part of any of ``fields``, best first.
+
+    This uses the ``%>`` word-similarity operator, which the
+    ``gin_trgm_ops`` indexes answer, with ``threshold`` applied for the
+    current transaction only. Evaluate the result inside that transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL pg_trgm.word_similarity_threshold = %s", [threshold])
+
+    lookup = Q()
+    for field in fields:
+        lookup |= Q(**{f"{field}__trigram_word_similar": text})
+    similarities = [TrigramWordSimilarity(text, field) for field in fields]
+    similarity = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+    return (
+        queryset.filter(lookup)
+        .annotate(similarity=similarity)
+        .order_by("-similarity", "-created_at")
+    )
+
+
+class FuzzyLookupMixin:
+    """
+    Adds ``GET <list>/fuzzy/?q=&threshold=&limit=`` over ``fuzzy_fields``.
+    """
+
+    fuzzy_fields = ()
+
+    @action(detail=False, methods=["get"], url_path="fuzzy")
+    def fuzzy(self, request, *args, **kwargs):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"success": False, "info": "q is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            threshold = float(request.query_params.get("threshold", FUZZY_THRESHOLD))
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            return Response(
+                {"success": False, "info": "threshold and limit must be numbers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 0 <= threshold <= 1:
+            return Response(
+                {"success": False, "info": "threshold must be between 0 and 1"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if limit < 1:
+            return Response(
+                {"success": False, "info": "limit must be at least 1"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        with transaction.atomic():
+            queryset = fuzzy_lookup(
+                self.filter_queryset(self.get_queryset()), text, self.fuzzy_fields, threshold
+            )[:limit]
+            data = self.get_serializer(queryset, many=True).data
+        return Response({"success": True, "info": data}, status=status.HTTP_200_OK)
@@ -13,9 +13,13 @@ from apps.assets.models import (
     LicenseHistory,
     LicenseCheckout
 )
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from apps.assets.images import RENDITION_FORMATS, RENDITION_SIZES, rendition_name, renditions_are_current
+from apps.core.mixins import SparseFieldsetSerializerMixin
+from apps.assets.registry import asset_categories, statuses
 
-class AssetCategorySerializer(serializers.ModelSerializer):
+class AssetCategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = AssetCategory
         fields = "__all__"
@@ -27,17 +31,24 @@ class AssetAssignmentCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class AssetAssignmentListSerializer(serializers.ModelSerializer):
+class AssetAssignmentListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     asset = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
 
+    related_fields = {
+        "asset": ("id", "uid", "name", "status"),
+        "user": ("id", "uid", "username"),
+    }
+    field_sources = {"status": ("asset",)}
+
     def get_status(self,obj):
-        if obj.status:
+        asset_status = statuses.by_id(obj.asset.status_id)
+        if asset_status:
             return{
-                'id':obj.status.id,
-                'uid':obj.status.uid,
-                'name':obj.status.name
+                'id':asset_status.id,
+                'uid':asset_status.uid,
+                'name':asset_status.name
 
             }
 
@@ -70,10 +81,15 @@ class AssetHistoryCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
     
-class AssetHistoryListSerializer(serializers.ModelSerializer):
+class AssetHistoryListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     asset = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
+    related_fields = {
+        "asset": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
+
     def get_asset(self,obj):
         if obj.asset:
             return {
@@ -105,10 +121,15 @@ class AssetRequestCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class AssetRequestListSerializer(serializers.ModelSerializer):
+class AssetRequestListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     asset = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
+    related_fields = {
+        "asset": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
+
     def get_asset(self,obj):
         if obj.asset:
             return {
@@ -139,10 +160,15 @@ class MaintenanceRequestCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class MaintenanceRequestListSerializer(serializers.ModelSerializer):
+class MaintenanceRequestListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     asset = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
+    related_fields = {
+        "asset": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
+
     def get_asset(self,obj):
         if obj.asset:
             return {
@@ -167,13 +193,13 @@ class MaintenanceRequestListSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class AssetStatusSerializer(serializers.ModelSerializer):
+class AssetStatusSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = AssetStatus
         fields = "__all__"
 
 
-class SoftwareCategorySerializer(serializers.ModelSerializer):
+class SoftwareCategorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = SoftwareCategory
         fields = "__all__"
@@ -185,10 +211,15 @@ class AssetReturnCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class AssetReturnListSerializer(serializers.ModelSerializer):
+class AssetReturnListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     asset = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
+    related_fields = {
+        "asset": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
+
     def get_asset(self,obj):
         if obj.asset:
             return {
@@ -213,7 +244,7 @@ class AssetReturnListSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class AssetSupplierSerializer(serializers.ModelSerializer):
+class AssetSupplierSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = AssetSupplier
         fields = "__all__"
@@ -225,7 +256,7 @@ class SoftwareLicencesCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class SoftwareLicencesListSerializer(serializers.ModelSerializer):
+class SoftwareLicencesListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = SoftwareLicences
@@ -233,9 +264,14 @@ class SoftwareLicencesListSerializer(serializers.ModelSerializer):
 
 
 
-class AssetAssignmentHistorySerializer(serializers.ModelSerializer):
+class AssetAssignmentHistorySerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
     asset = serializers.SerializerMethodField()
+
+    related_fields = {
+        "asset": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
      
 
     def get_user(self,obj):
@@ -267,16 +303,21 @@ class LicenseHistoryCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class LicenseHistoryListSerializer(serializers.ModelSerializer):
-    asset = serializers.SerializerMethodField()
+class LicenseHistoryListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    licence = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
-    def get_asset(self,obj):
-        if obj.asset:
+    related_fields = {
+        "licence": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
+
+    def get_licence(self,obj):
+        if obj.licence:
             return {
-                'id':obj.asset.id,
-                'uid':obj.asset.uid,
-                'name':obj.asset.name,
+                'id':obj.licence.id,
+                'uid':obj.licence.uid,
+                'name':obj.licence.name,
             }
         return {}
     
@@ -302,16 +343,21 @@ class LicenseCheckoutCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class LicenseCheckoutListSerializer(serializers.ModelSerializer):
+class LicenseCheckoutListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     licence = serializers.SerializerMethodField()
     user = serializers.SerializerMethodField()
 
+    related_fields = {
+        "licence": ("id", "uid", "name"),
+        "user": ("id", "uid", "username"),
+    }
+
     def get_licence(self,obj):
         if obj.licence:
             return {
                 'id':obj.licence.id,
                 'uid':obj.licence.uid,
-                'name':obj.licence.username,
+                'name':obj.licence.name,
             }
     
         return {}
@@ -335,31 +381,98 @@ class LicenseCheckoutListSerializer(serializers.ModelSerializer):
 class AssetCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Asset
-        fields = "__all__"
-
-
-class AssetListSerializer(serializers.ModelSerializer):
+        exclude = ["search_vector"]
+        read_only_fields = ["image_renditions"]
+
+
+class AssetImportRowSerializer(serializers.Serializer):
+    """
+    Validates one row of a bulk import file.
+
+    Relations are given by name and uniqueness is checked per chunk by the
+    importer, so validating a row never touches the database.
+    """
+
+    name = serializers.CharField(max_length=255)
+    serial_no = serializers.CharField(max_length=255)
+    tag = serializers.CharField(max_length=255)
+    category = serializers.CharField(max_length=255)
+    status = serializers.CharField(max_length=255)
+    supplier = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    purchase_date = serializers.DateField()
+    purchase_price = serializers.FloatField()
+    model = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    condition = serializers.ChoiceField(choices=["new", "used"], required=False, allow_blank=True)
+    order_number = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    description = serializers.CharField(required=False, allow_blank=True)
+    requestable = serializers.BooleanField(required=False, default=True)
+
+
+class AssetListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     supplier = serializers.SerializerMethodField()
     current_assignee = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
 
+    image = serializers.SerializerMethodField()
+    image_renditions = serializers.SerializerMethodField()
+
+    # category and status come from the in-process registry
+    related_fields = {
+        "supplier": ("id", "uid", "name"),
+        "current_assignee": ("id", "uid", "username"),
+    }
+    field_sources = {
+        "image": ("image_renditions",),
+        "image_renditions": ("image",),
+    }
+    deferred_fields = ("search_vector",)
+
+    def image_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def get_image(self, obj):
+        # lists default to the thumbnail; ?image_size=card|full|original overrides
+        view = self.context.get("view")
+        request = self.context.get("request")
+        size = "thumbnail" if view is not None and view.action in ("list", "search", "fuzzy") else "full"
+        if request is not None:
+            size = request.query_params.get("image_size", size)
+        return self.image_url(rendition_name(obj, size))
+
+    def get_image_renditions(self, obj):
+        if not renditions_are_current(obj):
+            return {}
+        return {
+            size: {
+                image_format: self.image_url(obj.image_renditions[size][image_format])
+                for image_format in RENDITION_FORMATS
+            }
+            for size in RENDITION_SIZES
+        }
+
     def get_category(self,obj):
-        if obj.category:
+        category = asset_categories.by_id(obj.category_id)
+        if category:
             return {
-                'id':obj.category.id,
-                'uid':obj.category.uid,
-                'name':obj.category.name,
+                'id':category.id,
+                'uid':category.uid,
+                'name':category.name,
             }
     
         return {}
 
     def get_status(self,obj):
-        if obj.status:
+        asset_status = statuses.by_id(obj.status_id)
+        if asset_status:
             return {
-                'id':obj.status.id,
-                'uid':obj.status.uid,
-                'name':obj.status.name,
+                'id':asset_status.id,
+                'uid':asset_status.uid,
+                'name':asset_status.name,
             }
     
         return {}
@@ -386,4 +499,4 @@ class AssetListSerializer(serializers.ModelSerializer):
         return {}
     class Meta:
         model = Asset
-        fields = "__all__"
\ No newline at end of file
+        exclude = ["search_vector"]
\ No newline at end of file
@@ -0,0 +1,165 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+
+from apps.assets import history, partitions, registry, storage
+from apps.assets.images import renditions_are_current
+from apps.assets.models import (
+    Asset,
+    AssetCategory,
+    AssetHistory,
+    AssetSupplier,
+    LicenseCheckout,
+    LicenseHistory,
+)
+from apps.assets.search import update_search_vectors
+from apps.assets.transitions import asset_transitioned
+from apps.assets.tasks import generate_asset_renditions
+from apps.core.response_cache import invalidate_models
+from apps.people.models import User
+
+
+def invalidate_reference_table(sender, **kwargs):
+    # invalidate after commit so other processes never reload stale rows
+    transaction.on_commit(registry.TABLES[sender].invalidate)
+
+
+for model in registry.TABLES:
+    post_save.connect(invalidate_reference_table, sender=model)
+    post_delete.connect(invalidate_reference_table, sender=model)
+
+
+def bump_model_tag(sender, **kwargs):
+    # cached list responses built from this model stop being addressed
+    invalidate_models([sender])
+
+
+for model in apps.get_app_config("assets").get_models():
+    post_save.connect(bump_model_tag, sender=model)
+    post_delete.connect(bump_model_tag, sender=model)
+
+
+def schedule_renditions(sender, instance, **kwargs):
+    if instance.image and not renditions_are_current(instance):
+        asset_id = instance.id
+        transaction.on_commit(lambda: generate_asset_renditions.delay(asset_id))
+
+
+post_save.connect(schedule_renditions, sender=Asset)
+
+
+def remember_previous_image(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding:
+        instance._previous_image = None
+    elif update_fields is None or "image" in update_fields:
+        instance._previous_image = (
+            Asset.objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+        )
+    else:
+        return
+    # an upload not stored yet takes its own reference in storage.claim_blob
+    instance._image_claimed = bool(instance.image) and not instance.image._committed
+
+
+def count_image_references(sender, instance, **kwargs):
+    # maintains MediaBlob.refcount for the content-addressed image storage
+    if "_previous_image" not in instance.__dict__:
+        return
+    previous = instance.__dict__.pop("_previous_image") or None
+    claimed = instance.__dict__.pop("_image_claimed")
+    current = instance.image.name or None
+    if previous == current and not claimed:
+        return
+    if current and not claimed:
+        storage.retain(current)
+    if previous:
+        storage.release(previous)
+
+
+def release_deleted_image(sender, instance, **kwargs):
+    if instance.image:
+        storage.release(instance.image.name)
+
+
+pre_save.connect(remember_previous_image, sender=Asset)
+post_save.connect(count_image_references, sender=Asset)
+post_delete.connect(release_deleted_image, sender=Asset)
+
+
+# Asset columns that feed the search vector, as update_fields may name them.
+SEARCHED_ASSET_FIELDS = {
+    "name", "serial_no", "tag", "model", "order_number", "description",
+    "category", "category_id", "supplier", "supplier_id", "current_assignee", "current_assignee_id",
+}
+
+# Related rows whose columns feed the search vector of the assets pointing at them.
+SEARCHED_RELATED_FIELDS = {
+    AssetCategory: ("category", ("name",)),
+    AssetSupplier: ("supplier", ("name",)),
+    User: ("current_assignee", ("username", "first_name", "last_name")),
+}
+
+
+def refresh_asset_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHED_ASSET_FIELDS.intersection(update_fields):
+        return
+    update_search_vectors(Asset.objects.filter(pk=instance.pk))
+
+
+def refresh_transitioned_search_vector(sender, asset_id, **kwargs):
+    # the assignee's name is part of the vector
+    update_search_vectors(Asset.objects.filter(pk=asset_id))
+
+
+def remember_previous_search_values(sender, instance, update_fields=None, **kwargs):
+    fields = SEARCHED_RELATED_FIELDS[sender][1]
+    if instance._state.adding:
+        return
+    if update_fields is None or set(fields).intersection(update_fields):
+        instance._previous_search_values = (
+            sender.objects.filter(pk=instance.pk).values_list(*fields).first()
+        )
+
+
+def refresh_related_search_vectors(sender, instance, **kwargs):
+    if "_previous_search_values" not in instance.__dict__:
+        return
+    previous = instance.__dict__.pop("_previous_search_values")
+    relation, fields = SEARCHED_RELATED_FIELDS[sender]
+    if previous == tuple(getattr(instance, field) for field in fields):
+        return
+    update_search_vectors(Asset.objects.filter(**{relation: instance}))
+
+
+post_save.connect(refresh_asset_search_vector, sender=Asset)
+asset_transitioned.connect(refresh_transitioned_search_vector)
+for model in SEARCHED_RELATED_FIELDS:
+    pre_save.connect(remember_previous_search_values, sender=model)
+    post_save.connect(refresh_related_search_vectors, sender=model)
+
+
+def record_asset_history(sender, asset_id, transition, user_id=None, **kwargs):
+    if user_id is not None:
+        history.record(AssetHistory, asset_id=asset_id, user_id=user_id, action_type=transition)
+
+
+def record_licence_checkout(sender, instance, created=False, **kwargs):
+    if created:
+        history.record(LicenseHistory, licence_id=instance.licence_id, user_id=instance.user_id, action_type="assigned")
+
+
+def record_licence_return(sender, instance, **kwargs):
+    history.record(LicenseHistory, licence_id=instance.licence_id, user_id=instance.user_id, action_type="returned")
+
+
+asset_transitioned.connect(record_asset_history)
+post_save.connect(record_licence_checkout, sender=LicenseCheckout)
+post_delete.connect(record_licence_return, sender=LicenseCheckout)
+
+
+def create_history_partitions(sender, using, **kwargs):
+    # every deploy migrates, so the coming months exist before anything writes to them
+    partitions.ensure_partitions(using=using)
+
+
+post_migrate.connect(create_history_partitions, sender=apps.get_app_config("assets"))
@@ -0,0 +1,130 @@
+"""
+Content-addressed file storage.
+
+Files are named by the SHA-256 of their content, computed while the upload
+is streamed to disk, e.g. ``assets/3f/3f9a...c1.jpg``. Identical uploads
+share one file, and a name always refers to the same bytes, so the web
+server can serve these paths with a far-future, immutable Cache-Control.
+Each stored file has a ``MediaBlob`` row counting the references to it.
+Saving an upload takes its reference; assigning an already stored name
+takes one in the Asset signals.
+
+The digest alone identifies a file: the same bytes uploaded again as
+``.jpeg`` or ``.JPG`` reuse the name the first upload was stored under.
+"""
+
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+
+def content_name(name, digest):
+    directory, basename = os.path.split(name)
+    extension = os.path.splitext(basename)[1].lower()
+    return os.path.join(directory, digest[:2], f"{digest}{extension}")
+
+
+def blob_name(name, digest):
+    """
+    Name the content with ``digest`` is, or would be, stored under.
+    """
+    MediaBlob = apps.get_model("assets", "MediaBlob")
+    existing = MediaBlob.objects.filter(sha256=digest).values_list("name", flat=True).first()
+    return existing or content_name(name, digest)
+
+
+def claim_blob(name, digest, size):
+    """
+    Take a reference to the content with ``digest`` and return its stored name.
+
+    The row is created with one reference, or locked while its count goes up,
+    so a concurrent ``release`` cannot delete the blob in between.
+    """
+    MediaBlob = apps.get_model("assets", "MediaBlob")
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                blob = MediaBlob.objects.select_for_update().filter(sha256=digest).first()
+                if blob is None:
+                    blob = MediaBlob.objects.create(
+                        sha256=digest, name=content_name(name, digest), size=size, refcount=1
+                    )
+                else:
+                    MediaBlob.objects.filter(id=blob.id).update(refcount=F("refcount") + 1)
+                return blob.name
+        except IntegrityError:
+            # created concurrently since the lookup; lock that row instead
+            if attempt:
+                raise
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    def _save(self, name, content):
+        directory = os.path.dirname(self.path(name))
+        os.makedirs(directory, exist_ok=True)
+
+        sha256 = hashlib.sha256()
+        size = 0
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                if hasattr(content, "seek"):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    temp_file.write(chunk)
+
+            name = claim_blob(name, sha256.hexdigest(), size)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return name.replace("\\", "/")
+
+    def get_available_name(self, name, max_length=None):
+        # the final name is only known once the content has been hashed
+        return name
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def retain(name):
+    MediaBlob = apps.get_model("assets", "MediaBlob")
+    MediaBlob.objects.filter(name=name).update(refcount=F("refcount") + 1)
+
+
+def release(name, storage=content_addressed_storage):
+    """
+    Drop one reference to ``name`` and delete the file after commit once unused.
+    """
+    MediaBlob = apps.get_model("assets", "MediaBlob")
+    MediaBlob.objects.filter(name=name, refcount__gt=0).update(refcount=F("refcount") - 1)
+
+    def delete_unused():
+        # claim_blob locks the same row, so the count cannot go up meanwhile
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None or blob.refcount:
+                return
+            blob.delete()
+            storage.delete(name)
+
+    transaction.on_commit(delete_unused)
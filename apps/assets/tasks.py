@@ -0,0 +1,39 @@
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+from PIL import UnidentifiedImageError
+
+from apps.assets.images import build_renditions
+from apps.assets.models import Asset
+from apps.assets.partitions import ensure_partitions
+from apps.core.response_cache import invalidate_models
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def generate_asset_renditions(self, asset_id):
+    asset = Asset.objects.filter(id=asset_id).only("id", "uid", "image").first()
+    if asset is None or not asset.image:
+        return
+
+    try:
+        renditions = build_renditions(asset)
+    except UnidentifiedImageError:
+        logger.warning("Asset %s image %s is not a readable image", asset_id, asset.image.name)
+        return
+    except OSError as error:
+        raise self.retry(exc=error)
+
+    # a newer upload has its own task; don't overwrite it with stale renditions
+    Asset.objects.filter(id=asset_id, image=asset.image.name).update(
+        image_renditions=renditions, updated_at=timezone.now()
+    )
+    invalidate_models([Asset])
+
+
+@shared_task
+def maintain_history_partitions():
+    # history rows are only insertable into months that have a partition
+    return ensure_partitions()
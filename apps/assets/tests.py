@@ -1,3 +1,987 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from apps.assets import history, partitions, transitions
+from apps.assets.registry import asset_categories, statuses
+from apps.assets.storage import content_addressed_storage
+from apps.assets.images import RENDITION_FORMATS, RENDITION_SIZES
+from apps.assets.models import (
+    Asset,
+    AssetAssignment,
+    AssetCategory,
+    AssetHistory,
+    AssetRequest,
+    AssetReturn,
+    AssetStatus,
+    AssetSupplier,
+    MaintenanceRequest,
+    MediaBlob,
+)
+from apps.assets.views import AssetRequestViewSet, AssetViewset, MaintenanceRequestViewSet
+from apps.core import response_cache
+from apps.core.filters import DeclarativeFilterBackend
+from apps.people.auth import Authenticator
+from apps.people.models import Department, Role, User
 
 # Create your tests here.
+
+# Response, principal and registry entries live in the cache; keep every test
+# on a private in-memory cache so nothing carries over from Redis or between tests.
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "asm-tests",
+    }
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AssetAPITestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.role = Role.objects.create(name="admin")
+        self.department = Department.objects.create(name="IT", manager="Manager")
+        self.user = self.create_user("admin")
+        # run the registry invalidation hooks for the reference rows
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category = AssetCategory.objects.create(name="Laptop")
+            self.ready = AssetStatus.objects.create(name="ready-to-deploy")
+            self.deployed = AssetStatus.objects.create(name="deployed")
+        self.supplier = AssetSupplier.objects.create(name="Dell")
+
+        self.client = APIClient()
+        token = Authenticator().generate_token(self.user.email)
+        self.client.credentials(HTTP_AUTHORIZATION=token)
+
+    def create_user(self, name):
+        count = User.objects.count()
+        return User.objects.create(
+            email=f"{name}@example.com",
+            password=make_password("password"),
+            employee_no=f"EMP-{count}",
+            phone=f"0200000{count}",
+            role=self.role,
+            department=self.department,
+        )
+
+    def create_asset(self, index, **kwargs):
+        fields = {
+            "name": f"Asset {index}",
+            "serial_no": f"SN-{index}",
+            "tag": f"TAG-{index}",
+            "purchase_date": datetime.date(2023, 1, 1),
+            "purchase_price": 1000.0,
+            "category": self.category,
+            "status": self.ready,
+            "supplier": self.supplier,
+        }
+        fields.update(kwargs)
+        return Asset.objects.create(**fields)
+
+
+class KeysetPaginationTestCase(AssetAPITestCase):
+    def collect(self, url):
+        names, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            names += [asset["name"] for asset in response.data["info"]]
+            pages.append(response.data)
+            url = response.data["next"]
+        return names, pages
+
+    def test_next_and_previous_cursors(self):
+        assets = [self.create_asset(index) for index in range(7)]
+
+        names, pages = self.collect("/api/assets/?page_size=3")
+        self.assertEqual(names, [asset.name for asset in reversed(assets)])
+        self.assertEqual([len(page["info"]) for page in pages], [3, 3, 1])
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["info"], pages[1]["info"])
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(response.data["info"], pages[0]["info"])
+
+    def test_rows_sharing_a_timestamp_are_paged_by_id(self):
+        assets = [self.create_asset(index) for index in range(5)]
+        Asset.objects.update(created_at=timezone.now())
+
+        names, _ = self.collect("/api/assets/?page_size=2")
+        self.assertEqual(names, [asset.name for asset in sorted(assets, key=lambda asset: -asset.id)])
+
+    def test_invalid_cursors_are_rejected(self):
+        self.create_asset(0)
+
+        def encode(querystring):
+            return base64.urlsafe_b64encode(querystring.encode("utf-8")).decode("ascii")
+
+        cursors = [
+            "not-a-cursor",
+            encode("r=0&i=1"),
+            encode("r=0&v=yesterday&i=1"),
+            encode("r=0&v=2024-01-01T00:00:00%2B00:00&i=one"),
+        ]
+        for cursor in cursors:
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/assets/", {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("cursor", response.data)
+
+
+class SparseFieldsetTestCase(AssetAPITestCase):
+    def test_fields_select_top_level_and_nested_keys(self):
+        self.create_asset(0)
+
+        response = self.client.get("/api/assets/", {"fields": "uid,tag,status.name"})
+        self.assertEqual(response.status_code, 200)
+        asset = response.data["info"][0]
+        self.assertEqual(set(asset), {"uid", "tag", "status"})
+        self.assertEqual(asset["status"], {"name": "ready-to-deploy"})
+
+    def test_expand_keeps_the_nested_object_whole(self):
+        self.create_asset(0)
+
+        response = self.client.get("/api/assets/", {"fields": "uid,supplier.name", "expand": "supplier"})
+        asset = response.data["info"][0]
+        self.assertEqual(set(asset), {"uid", "supplier"})
+        self.assertEqual(set(asset["supplier"]), {"id", "uid", "name"})
+
+    def test_unselected_columns_are_not_read(self):
+        self.create_asset(0)
+        self.client.get("/api/assets/", {"fields": "uid,tag"})
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get("/api/assets/", {"fields": "uid,tag"})
+        [select] = [query["sql"] for query in context.captured_queries if 'ORDER BY "assets_asset"' in query["sql"]]
+        self.assertIn('"assets_asset"."tag"', select)
+        self.assertNotIn('"assets_asset"."description"', select)
+        self.assertNotIn("assets_assetsupplier", select)
+
+    def test_fields_apply_to_detail(self):
+        asset = self.create_asset(0)
+
+        response = self.client.get(f"/api/assets/{asset.uid}/", {"fields": "uid,category.name"})
+        self.assertEqual(response.data["info"], {"uid": str(asset.uid), "category": {"name": "Laptop"}})
+
+
+class ImageRenditionTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.asset = self.create_asset(0)
+        image = f"assets/{self.asset.uid}.jpg"
+        renditions = {"source": image}
+        for size in RENDITION_SIZES:
+            renditions[size] = {
+                extension: f"assets/renditions/{self.asset.uid}/{size}.{extension}"
+                for extension in RENDITION_FORMATS
+            }
+        # skip the upload hooks, only the stored names matter here
+        Asset.objects.filter(id=self.asset.id).update(image=image, image_renditions=renditions)
+
+    def image(self, url, query=None):
+        response = self.client.get(url, query or {})
+        self.assertEqual(response.status_code, 200)
+        info = response.data["info"]
+        return (info[0] if isinstance(info, list) else info)["image"]
+
+    def test_lists_get_the_thumbnail_and_detail_the_full_size(self):
+        self.assertTrue(self.image("/api/assets/").endswith("/thumbnail.webp"))
+        self.assertTrue(self.image(f"/api/assets/{self.asset.uid}/").endswith("/full.webp"))
+
+    def test_image_size_overrides_the_default(self):
+        self.assertTrue(self.image("/api/assets/", {"image_size": "card"}).endswith("/card.webp"))
+        self.assertTrue(self.image(f"/api/assets/{self.asset.uid}/", {"image_size": "thumbnail"}).endswith("/thumbnail.webp"))
+        self.assertTrue(self.image("/api/assets/", {"image_size": "original"}).endswith(f"/{self.asset.uid}.jpg"))
+
+    def test_stale_renditions_fall_back_to_the_original(self):
+        Asset.objects.filter(id=self.asset.id).update(image="assets/replacement.jpg")
+
+        self.assertTrue(self.image("/api/assets/").endswith("/replacement.jpg"))
+        response = self.client.get(f"/api/assets/{self.asset.uid}/")
+        self.assertEqual(response.data["info"]["image_renditions"], {})
+
+
+class ContentAddressedStorageTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.media_root = media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_same_bytes_under_another_extension_share_one_blob(self):
+        content = b"\xff\xd8\xff\xe0 not really a photo"
+        first = self.create_asset(0, image=SimpleUploadedFile("photo.jpg", content))
+        second = self.create_asset(1, image=SimpleUploadedFile("photo.JPEG", content))
+        third = self.create_asset(2, image=SimpleUploadedFile("scan.jpeg", content))
+
+        self.assertEqual({first.image.name, second.image.name, third.image.name}, {first.image.name})
+        self.assertTrue(first.image.name.endswith(".jpg"))
+        blob = MediaBlob.objects.get()
+        self.assertEqual((blob.name, blob.refcount), (first.image.name, 3))
+        self.assertEqual(sorted(os.listdir(os.path.dirname(first.image.path))), [os.path.basename(first.image.name)])
+
+    def test_a_blob_claimed_again_before_its_release_commits_is_kept(self):
+        content = b"\xff\xd8\xff\xe0 not really a photo"
+        asset = self.create_asset(0, image=SimpleUploadedFile("photo.jpg", content))
+        name = asset.image.name
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            asset.delete()
+        self.assertEqual(MediaBlob.objects.get().refcount, 0)
+
+        # a concurrent upload of the same bytes is stored, but its asset row
+        # is not saved yet, when the cleanup runs
+        self.assertEqual(content_addressed_storage.save("assets/copy.jpg", ContentFile(content)), name)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(MediaBlob.objects.get().refcount, 1)
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+
+    def test_dedupe_media_repoints_renditions_and_invalidates_lists(self):
+        os.makedirs(os.path.join(self.media_root, "assets"))
+        for filename in ("photo.jpg", "copy.jpg"):
+            with open(os.path.join(self.media_root, "assets", filename), "wb") as handle:
+                handle.write(b"\xff\xd8\xff\xe0 not really a photo")
+        built = self.create_asset(0, image="assets/photo.jpg")
+        Asset.objects.filter(id=built.id).update(image_renditions={"source": "assets/photo.jpg", "thumbnail": {}})
+        pending = self.create_asset(1, image="assets/copy.jpg")
+        tag = response_cache.model_tag(Asset)
+        version = response_cache.get_tag_versions([tag])
+
+        with mock.patch("apps.assets.management.commands.dedupe_media.generate_asset_renditions") as task:
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("dedupe_media", stdout=StringIO())
+
+        built.refresh_from_db()
+        pending.refresh_from_db()
+        self.assertEqual(built.image.name, pending.image.name)
+        self.assertEqual(built.image_renditions["source"], built.image.name)
+        task.delay.assert_called_once_with(pending.id)
+        self.assertNotEqual(response_cache.get_tag_versions([tag]), version)
+        self.assertEqual(MediaBlob.objects.get().refcount, 2)
+
+
+class SearchVectorRefreshTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.asset = self.create_asset(0, current_assignee=self.user)
+        patcher = mock.patch("apps.assets.signals.update_search_vectors")
+        self.update_search_vectors = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertRefreshed(self, refreshed):
+        self.assertEqual(self.update_search_vectors.called, refreshed)
+        self.update_search_vectors.reset_mock()
+
+    def test_asset_saves_of_unsearched_columns_are_skipped(self):
+        self.asset.save(update_fields=["image_renditions"])
+        self.assertRefreshed(False)
+        self.asset.save(update_fields=["name"])
+        self.assertRefreshed(True)
+        self.asset.save()
+        self.assertRefreshed(True)
+
+    def test_related_rows_refresh_only_when_a_searched_value_changes(self):
+        self.user.save(update_fields=["last_login"])
+        self.assertRefreshed(False)
+        self.user.save()
+        self.assertRefreshed(False)
+        self.user.first_name = "Ama"
+        self.user.save()
+        self.assertRefreshed(True)
+
+        self.category.save()
+        self.assertRefreshed(False)
+        self.category.name = "Notebook"
+        self.category.save(update_fields=["name"])
+        self.assertRefreshed(True)
+
+
+class SearchTestCase(AssetAPITestCase):
+    def test_invalid_queries_are_rejected(self):
+        for query in (
+            {"q": " "},
+            {"q": "laptop", "limit": "many"},
+            {"q": "laptop", "limit": "0"},
+            {"q": "laptop", "limit": "-1"},
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get("/api/assets/search/", query).status_code, 400)
+
+
+class FuzzyLookupTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_asset(0, model="Lenovo ThinkPad X1")
+        self.create_asset(1, model="Lenovo ThinkPad T14")
+        self.create_asset(2, model="Dell Latitude 5440")
+
+    def fuzzy(self, query):
+        response = self.client.get("/api/assets/fuzzy/", query)
+        return response.status_code, response.data["info"]
+
+    def test_limit_caps_the_matches(self):
+        code, info = self.fuzzy({"q": "thinkpad", "limit": 1})
+        self.assertEqual(code, 200)
+        self.assertEqual(len(info), 1)
+        self.assertIn("ThinkPad", info[0]["model"])
+
+    def test_invalid_threshold_and_limit_are_rejected(self):
+        for query in (
+            {"q": "thinkpad", "threshold": "close"},
+            {"q": "thinkpad", "threshold": "1.5"},
+            {"q": "thinkpad", "threshold": "nan"},
+            {"q": "thinkpad", "limit": "many"},
+            {"q": "thinkpad", "limit": "0"},
+            {"q": "thinkpad", "limit": "-1"},
+            {"q": " "},
+        ):
+            with self.subTest(query=query):
+                self.assertEqual(self.fuzzy(query)[0], 400)
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "needs pg_trgm")
+    def test_threshold_controls_how_close_a_match_must_be(self):
+        # a transposed letter still matches at the default threshold
+        code, info = self.fuzzy({"q": "thinkpda"})
+        self.assertEqual(code, 200)
+        self.assertCountEqual([asset["model"] for asset in info], ["Lenovo ThinkPad X1", "Lenovo ThinkPad T14"])
+
+        self.assertEqual(self.fuzzy({"q": "thinkpda", "threshold": "0.9"})[1], [])
+        code, info = self.fuzzy({"q": "latitude 5440", "threshold": "0.9"})
+        self.assertEqual([asset["model"] for asset in info], ["Dell Latitude 5440"])
+
+
+class ListQueryCountTestCase(AssetAPITestCase):
+    def create_rows(self, start, count):
+        # run the cache invalidation hooks, as a committed write would
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(start, start + count):
+                asset = self.create_asset(
+                    index, status=self.deployed, current_assignee=self.user
+                )
+                AssetAssignment.objects.create(asset=asset, user=self.user)
+                AssetReturn.objects.create(asset=asset, user=self.user)
+                AssetRequest.objects.create(
+                    asset=asset, user=self.user, request_date=datetime.date.today()
+                )
+                MaintenanceRequest.objects.create(
+                    asset=asset, user=self.user, description="Broken screen"
+                )
+
+    def count_queries(self, url, expected_rows):
+        self.client.get(url)
+        # drop the cached response so the list queryset itself is measured
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["info"]), expected_rows)
+        return len(context.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        urls = [
+            "/api/assets/",
+            "/api/asset-assignments/",
+            "/api/asset-returns/",
+            "/api/asset-requests/",
+            "/api/maintenance-requests/",
+        ]
+
+        self.create_rows(0, 2)
+        small = {url: self.count_queries(url, 2) for url in urls}
+
+        self.create_rows(2, 8)
+        large = {url: self.count_queries(url, 10) for url in urls}
+
+        self.assertEqual(small, large)
+
+
+class RegistryTestCase(AssetAPITestCase):
+    def test_lookups_run_no_queries(self):
+        statuses.by_id(self.ready.id)
+        asset_categories.by_id(self.category.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(statuses.by_id(self.ready.id).name, "ready-to-deploy")
+            self.assertEqual(statuses.by_name("deployed").id, self.deployed.id)
+            self.assertEqual(statuses.by_uid(self.deployed.uid).id, self.deployed.id)
+            self.assertEqual(asset_categories.by_id(self.category.id).name, "Laptop")
+            self.assertEqual(len(statuses.all()), 2)
+
+    def test_saves_and_deletes_invalidate_the_snapshot(self):
+        self.assertIsNotNone(statuses.by_name("ready-to-deploy"))
+
+        self.ready.name = "available"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ready.save()
+        self.assertEqual(statuses.by_id(self.ready.id).name, "available")
+        self.assertIsNone(statuses.by_name("ready-to-deploy"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.deployed.delete()
+        self.assertNotIn("deployed", [row.name for row in statuses.all()])
+
+    def test_rows_created_elsewhere_are_found_before_invalidation(self):
+        statuses.by_id(self.ready.id)
+        # another process: its invalidation hook has not bumped the version yet
+        with self.captureOnCommitCallbacks():
+            lost = AssetStatus.objects.create(name="lost")
+
+        self.assertEqual(statuses.by_id(lost.id).name, "lost")
+        with self.assertNumQueries(0):
+            self.assertEqual(statuses.by_name("lost").id, lost.id)
+        self.assertIsNone(statuses.by_id(lost.id + 1))
+        self.assertIsNone(statuses.by_uid("not-a-uuid"))
+
+
+class CachedListTestCase(AssetAPITestCase):
+    def test_committed_writes_invalidate_cached_lists(self):
+        self.create_asset(0)
+        self.assertEqual(len(self.client.get("/api/assets/").data["info"]), 1)
+
+        # the tag is only bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_asset(1)
+        self.assertEqual(len(self.client.get("/api/assets/").data["info"]), 2)
+
+
+class ExportTestCase(AssetAPITestCase):
+    def test_export_streams_the_views_queryset(self):
+        class AssignedAssetViewset(AssetViewset):
+            def get_queryset(self):
+                return super().get_queryset().filter(current_assignee=self.request.user)
+
+        mine = self.create_asset(0, status=self.deployed, current_assignee=self.user)
+        self.create_asset(1)
+
+        request = APIRequestFactory().get("/", {"output": "ndjson"})
+        force_authenticate(request, user=self.user, token={"user_id": self.user.id})
+        response = AssignedAssetViewset.as_view({"get": "export"})(request)
+        self.assertEqual(response.status_code, 200)
+
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["uid"] for line in lines], [str(mine.uid)])
+
+
+class ConditionalGetTestCase(AssetAPITestCase):
+    def test_unchanged_list_is_not_modified(self):
+        self.create_asset(0)
+        response = self.client.get("/api/assets/")
+        self.assertIn("Authorization", response["Vary"])
+
+        response = self.client.get("/api/assets/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_depends_on_the_callers_role(self):
+        self.create_asset(0)
+        colleague = self.create_user("colleague")
+        manager = self.create_user("manager")
+        manager.role = Role.objects.create(name="manager")
+        manager.save()
+
+        def get(user, etag):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=Authenticator().generate_token(user.email))
+            return client.get("/api/assets/", HTTP_IF_NONE_MATCH=etag)
+
+        etag = self.client.get("/api/assets/")["ETag"]
+        # nothing is written between these requests; only the role differs
+        self.assertEqual(get(colleague, etag).status_code, 304)
+        response = get(manager, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_validation_reads_no_table(self):
+        self.create_asset(0)
+        etag = self.client.get("/api/assets/")["ETag"]
+        # the principal lookup is cached by the first request
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/assets/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_committed_writes_change_the_etag(self):
+        asset = self.create_asset(0)
+        etag = self.client.get("/api/assets/")["ETag"]
+
+        asset.name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            asset.save()
+        response = self.client.get("/api/assets/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class AssetImportTestCase(AssetAPITestCase):
+    header = "name,serial_no,tag,category,status,supplier,purchase_date,purchase_price\n"
+
+    def upload(self, rows):
+        upload = SimpleUploadedFile("assets.csv", (self.header + rows).encode("utf-8"), content_type="text/csv")
+        return self.client.post("/api/assets/bulk-import/", {"file": upload}, format="multipart")
+
+    def test_valid_rows_are_created(self):
+        response = self.upload(
+            "Laptop 1,SN-1,TAG-1,Laptop,ready-to-deploy,Dell,2024-01-01,1200\n"
+            "Laptop 2,SN-2,TAG-2,Laptop,ready-to-deploy,,2024-01-01,900\n"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["info"], {"created": 2, "failed": 0, "errors": []})
+        self.assertEqual(Asset.objects.get(serial_no="SN-1").supplier, self.supplier)
+
+    def test_invalid_rows_are_reported_by_line(self):
+        response = self.upload(
+            "Laptop 1,SN-1,TAG-1,Laptop,ready-to-deploy,Dell,2024-01-01,1200\n"
+            "Laptop 2,SN-2,TAG-2,Phone,lost,Acme,2024-01-01,900\n"
+            "Laptop 3,SN-3,TAG-3,Laptop,ready-to-deploy,Dell,someday,cheap\n"
+        )
+        self.assertEqual(response.status_code, 201)
+        report = response.data["info"]
+        self.assertEqual((report["created"], report["failed"]), (1, 2))
+        self.assertEqual([error["row"] for error in report["errors"]], [3, 4])
+        self.assertEqual(set(report["errors"][0]["errors"]), {"category", "status", "supplier"})
+        self.assertEqual(set(report["errors"][1]["errors"]), {"purchase_date", "purchase_price"})
+
+    def test_duplicates_in_the_file_and_the_database_are_rejected(self):
+        self.create_asset(0)
+
+        response = self.upload(
+            "Copy,SN-0,TAG-new,Laptop,ready-to-deploy,,2024-01-01,100\n"
+            "First,SN-1,TAG-1,Laptop,ready-to-deploy,,2024-01-01,100\n"
+            "Second,SN-1,TAG-1,Laptop,ready-to-deploy,,2024-01-01,100\n"
+        )
+        report = response.data["info"]
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["errors"][0], {"row": 2, "errors": {"serial_no": ["Asset with this serial no already exists"]}})
+        self.assertEqual(report["errors"][1]["row"], 4)
+        self.assertEqual(set(report["errors"][1]["errors"]), {"serial_no", "tag"})
+        self.assertEqual(Asset.objects.filter(serial_no="SN-1").get().name, "First")
+
+    def test_a_file_without_valid_rows_is_a_bad_request(self):
+        response = self.upload("Laptop 1,SN-1,TAG-1,Phone,ready-to-deploy,,2024-01-01,1200\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data["success"])
+        self.assertFalse(Asset.objects.exists())
+
+
+class BulkApprovalTestCase(AssetAPITestCase):
+    def request_asset(self, asset, user):
+        return AssetRequest.objects.create(asset=asset, user=user, request_date=datetime.date.today())
+
+    def test_approvals_go_through_the_assign_transition(self):
+        other = self.create_user("other")
+        first = self.request_asset(self.create_asset(0), self.user)
+        second = self.request_asset(self.create_asset(1), other)
+        rival = self.request_asset(first.asset, other)
+        stale = self.request_asset(self.create_asset(2, requestable=False), other)
+        rejected = self.request_asset(self.create_asset(3), other)
+
+        transitioned = []
+
+        def record(sender, asset_id, transition, user_id, **kwargs):
+            transitioned.append((asset_id, transition, user_id))
+
+        transitions.asset_transitioned.connect(record)
+        self.addCleanup(transitions.asset_transitioned.disconnect, record)
+
+        items = [
+            {"asset_request": first.id, "status": "approved"},
+            {"asset_request": second.id, "status": "approved"},
+            {"asset_request": rival.id, "status": "approved"},
+            {"asset_request": stale.id, "status": "approved"},
+            {"asset_request": rejected.id, "status": "rejected"},
+        ]
+        response = self.client.post("/api/asset-requests/bulk-approval/", {"items": items}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [outcome["success"] for outcome in response.data["info"]], [True, True, False, False, True]
+        )
+        self.assertEqual(response.data["info"][2]["info"], "Asset is not requestable at this time")
+        self.assertEqual(response.data["info"][3]["info"], "Asset is not requestable at this time")
+
+        self.assertCountEqual(
+            Asset.objects.filter(status=self.deployed, requestable=False).values_list("id", "current_assignee_id"),
+            [(first.asset_id, self.user.id), (second.asset_id, other.id)],
+        )
+        self.assertCountEqual(
+            transitioned,
+            [(first.asset_id, "assigned", self.user.id), (second.asset_id, "assigned", other.id)],
+        )
+        self.assertEqual(AssetAssignment.objects.count(), 2)
+        self.assertEqual(AssetRequest.objects.get(id=rival.id).status, "pending")
+        self.assertEqual(AssetRequest.objects.get(id=rejected.id).status, "rejected")
+
+
+class TransitionTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.repair = AssetStatus.objects.create(name="out for repair")
+            self.archived = AssetStatus.objects.create(name="archived")
+
+    def return_asset(self, asset):
+        return self.client.post("/api/asset-returns/", {"asset": asset.id}, format="json")
+
+    def test_returned_assets_go_back_into_stock(self):
+        asset = self.create_asset(0, status=self.deployed, current_assignee=self.user, requestable=False)
+
+        self.assertEqual(self.return_asset(asset).status_code, 201)
+        asset.refresh_from_db()
+        self.assertEqual(asset.status_id, self.ready.id)
+        self.assertIsNone(asset.current_assignee_id)
+        self.assertTrue(asset.requestable)
+
+        # a second return of the same asset finds it in stock already
+        self.assertEqual(self.return_asset(asset).status_code, 409)
+        self.assertEqual(AssetReturn.objects.filter(asset=asset).count(), 1)
+
+        # and it can be handed out again
+        transitions.assign(asset.id, self.user.id)
+
+    def test_repairs_start_only_from_repairable_statuses(self):
+        for asset_status, allowed in [
+            (self.ready, True),
+            (self.deployed, True),
+            (self.repair, False),
+            (self.archived, False),
+        ]:
+            with self.subTest(status=asset_status.name):
+                asset = self.create_asset(asset_status.id, status=asset_status)
+                if allowed:
+                    transitions.start_repair(asset.id, self.user.id)
+                    asset.refresh_from_db()
+                    self.assertEqual(asset.status_id, self.repair.id)
+                else:
+                    with self.assertRaises(transitions.TransitionConflict):
+                        transitions.start_repair(asset.id, self.user.id)
+
+
+class FilterTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user("other")
+        self.cheap = self.create_asset(0, purchase_price=200.0, requestable=True)
+        self.expensive = self.create_asset(
+            1,
+            purchase_price=3000.0,
+            purchase_date=datetime.date(2024, 6, 1),
+            status=self.deployed,
+            current_assignee=self.other,
+            requestable=False,
+        )
+
+    def filtered(self, view_class, query):
+        request = Request(APIRequestFactory().get("/", query))
+        return DeclarativeFilterBackend().filter_queryset(
+            request, view_class.queryset.all(), view_class()
+        )
+
+    def test_asset_filters(self):
+        cases = [
+            ({"status": self.ready.id}, [self.cheap]),
+            ({"status": f"{self.ready.id},{self.deployed.id}"}, [self.cheap, self.expensive]),
+            ({"current_assignee": self.other.id}, [self.expensive]),
+            ({"department": self.department.id}, [self.expensive]),
+            ({"purchase_price_min": "1000"}, [self.expensive]),
+            ({"purchase_date_max": "2023-12-31"}, [self.cheap]),
+            ({"requestable": "true"}, [self.cheap]),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertCountEqual(self.filtered(AssetViewset, query), expected)
+
+    def test_request_and_maintenance_filters(self):
+        today = datetime.date.today()
+        pending = AssetRequest.objects.create(asset=self.cheap, user=self.user, request_date=today)
+        approved = AssetRequest.objects.create(
+            asset=self.expensive, user=self.other, request_date=datetime.date(2024, 6, 1), status="approved"
+        )
+        cases = [
+            ({"status": "pending"}, [pending]),
+            ({"status": "pending,approved"}, [pending, approved]),
+            ({"user": self.other.id}, [approved]),
+            ({"asset": self.cheap.id}, [pending]),
+            ({"request_date_min": "2024-06-01", "request_date_max": "2024-06-01"}, [approved]),
+            ({"created_at_min": today.isoformat()}, [pending, approved]),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertCountEqual(self.filtered(AssetRequestViewSet, query), expected)
+
+    def test_datetime_ranges_cover_whole_days(self):
+        late = MaintenanceRequest.objects.create(asset=self.cheap, user=self.user, description="Fan noise")
+        early = MaintenanceRequest.objects.create(asset=self.cheap, user=self.user, description="Dead pixel")
+        MaintenanceRequest.objects.filter(id=late.id).update(
+            report_date=timezone.make_aware(datetime.datetime(2024, 6, 1, 23, 59))
+        )
+        MaintenanceRequest.objects.filter(id=early.id).update(
+            report_date=timezone.make_aware(datetime.datetime(2024, 6, 2, 0, 0))
+        )
+        cases = [
+            ({"report_date_max": "2024-06-01"}, [late]),
+            ({"report_date_min": "2024-06-02"}, [early]),
+            ({"report_date_min": "2024-06-01", "report_date_max": "2024-06-02"}, [late, early]),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertCountEqual(self.filtered(MaintenanceRequestViewSet, query), expected)
+
+    def test_invalid_filter_values_are_rejected(self):
+        cases = [
+            ("/api/assets/", {"status": "ready"}),
+            ("/api/assets/", {"status": "1,,2"}),
+            ("/api/assets/", {"requestable": "maybe"}),
+            ("/api/assets/", {"purchase_date_min": "yesterday"}),
+            ("/api/assets/", {"purchase_date_max": "2024-02-30"}),
+            ("/api/assets/", {"purchase_price_min": "cheap"}),
+            ("/api/assets/", {"purchase_price_max": "nan"}),
+            ("/api/assets/", {"purchase_price_min": "900", "purchase_price_max": "100"}),
+            ("/api/assets/", {"purchase_date_min": "2024-06-02", "purchase_date_max": "2024-06-01"}),
+            ("/api/maintenance-requests/", {"report_date_min": "2024-06-01T10:00"}),
+        ]
+        for url, query in cases:
+            with self.subTest(query=query):
+                response = self.client.get(url, query)
+                self.assertEqual(response.status_code, 400)
+                # the error names the offending parameter, the minimum for an inverted range
+                self.assertEqual(list(response.data), [next(iter(query))])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "needs the PostgreSQL planner")
+    def test_filters_use_index_scans(self):
+        today = datetime.date.today().isoformat()
+        cases = [
+            (AssetViewset, {"status": self.ready.id, "category": self.category.id}),
+            (AssetViewset, {"purchase_date_min": "2023-01-01", "purchase_date_max": today}),
+            (AssetViewset, {"purchase_price_min": "100", "purchase_price_max": "900"}),
+            (AssetRequestViewSet, {"status": "pending"}),
+            (AssetRequestViewSet, {"user": self.user.id, "status": "pending"}),
+            (AssetRequestViewSet, {"request_date_min": today}),
+            (MaintenanceRequestViewSet, {"status": "pending"}),
+            (MaintenanceRequestViewSet, {"user": self.user.id, "status": "pending"}),
+            (MaintenanceRequestViewSet, {"report_date_min": today}),
+        ]
+        with connection.cursor() as cursor:
+            # with sequential scans priced out, a seq scan in the plan means no index matched
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        for view_class, query in cases:
+            with self.subTest(view=view_class.__name__, query=query):
+                plan = self.filtered(view_class, query).explain()
+                self.assertNotIn("Seq Scan", plan)
+
+
+class TimelineTestCase(AssetAPITestCase):
+    def test_timeline_pages_through_every_stream_in_order(self):
+        asset = self.create_asset(0)
+        created = []
+        for _ in range(3):
+            created.append(AssetAssignment.objects.create(asset=asset, user=self.user))
+            created.append(AssetReturn.objects.create(asset=asset, user=self.user))
+            created.append(
+                AssetRequest.objects.create(asset=asset, user=self.user, request_date=datetime.date.today())
+            )
+            created.append(MaintenanceRequest.objects.create(asset=asset, user=self.user, description="Broken screen"))
+
+        response = self.client.get(f"/api/assets/{asset.uid}/timeline/", {"page_size": 5})
+        events = response.data["info"]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            events += response.data["info"]
+
+        self.assertEqual([event["uid"] for event in events], [row.uid for row in reversed(created)])
+        timestamps = [event["timestamp"] for event in events]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+    def test_events_sharing_a_timestamp_are_paged_by_stream_and_id(self):
+        asset = self.create_asset(0)
+        assignments = [AssetAssignment.objects.create(asset=asset, user=self.user) for _ in range(3)]
+        returns = [AssetReturn.objects.create(asset=asset, user=self.user) for _ in range(2)]
+        moment = timezone.now()
+        AssetAssignment.objects.update(created_at=moment)
+        AssetReturn.objects.update(created_at=moment)
+
+        events = []
+        url = f"/api/assets/{asset.uid}/timeline/?page_size=2"
+        while url:
+            response = self.client.get(url)
+            events += response.data["info"]
+            url = response.data["next"]
+
+        # returns rank after assignments, so they come first newest-first
+        expected = list(reversed(returns)) + list(reversed(assignments))
+        self.assertEqual([event["uid"] for event in events], [row.uid for row in expected])
+
+
+class HistoryFeedTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.asset = self.create_asset(0)
+        self.url = f"/api/assets/{self.asset.uid}/asset-history/"
+        self.now = timezone.now()
+
+    def create_history(self, days_ago):
+        with self.captureOnCommitCallbacks(execute=True):
+            history.record(AssetHistory, asset_id=self.asset.id, user_id=self.user.id, action_type="assigned")
+        entry = AssetHistory.objects.latest("id")
+        AssetHistory.objects.filter(id=entry.id).update(created_at=self.now - datetime.timedelta(days=days_ago))
+        return entry
+
+    def uids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [str(entry["uid"]) for entry in response.data["info"]]
+
+    def test_default_window_is_the_last_thirty_days(self):
+        recent = self.create_history(1)
+        self.create_history(history.FEED_WINDOW.days + 1)
+
+        self.assertEqual(self.uids(self.client.get(self.url)), [str(recent.uid)])
+
+    def test_explicit_window(self):
+        self.create_history(1)
+        older = self.create_history(40)
+        self.create_history(80)
+
+        params = {
+            "from": (self.now - datetime.timedelta(days=60)).date(),
+            "to": (self.now - datetime.timedelta(days=20)).date(),
+        }
+        self.assertEqual(self.uids(self.client.get(self.url, params)), [str(older.uid)])
+
+    def test_windows_longer_than_the_maximum_are_rejected(self):
+        end = self.now.date()
+        for days, status_code in ((history.MAX_FEED_WINDOW.days, 200), (history.MAX_FEED_WINDOW.days + 1, 400)):
+            with self.subTest(days=days):
+                params = {"from": end - datetime.timedelta(days=days), "to": end}
+                self.assertEqual(self.client.get(self.url, params).status_code, status_code)
+
+    def test_invalid_windows_are_rejected(self):
+        end = self.now.date()
+        for params in (
+            {"from": end, "to": end - datetime.timedelta(days=1)},
+            {"from": end, "to": end},
+            {"from": "yesterday"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.data["success"])
+
+    def test_cursor_pages_through_the_window(self):
+        entries = [self.create_history(days_ago) for days_ago in (25, 20, 15, 10, 5)]
+        self.create_history(45)
+        AssetHistory.objects.filter(id__in=[entries[1].id, entries[2].id]).update(
+            created_at=self.now - datetime.timedelta(days=12)
+        )
+
+        uids, url = [], f"{self.url}?page_size=2"
+        while url:
+            response = self.client.get(url)
+            uids += self.uids(response)
+            url = response.data["next"]
+        # newest first; the two rows sharing a timestamp are ordered by id
+        expected = [entries[4], entries[3], entries[2], entries[1], entries[0]]
+        self.assertEqual(uids, [str(entry.uid) for entry in expected])
+
+
+class HistoryBufferTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.asset = self.create_asset(0)
+
+    def record(self, action_type):
+        history.record(AssetHistory, asset_id=self.asset.id, user_id=self.user.id, action_type=action_type)
+
+    def test_events_are_written_once_at_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record("assigned")
+            self.record("returned")
+            self.assertFalse(AssetHistory.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record("repaired")
+
+        self.assertCountEqual(
+            AssetHistory.objects.values_list("action_type", flat=True), ["assigned", "returned", "repaired"]
+        )
+
+    def test_rolled_back_savepoints_drop_their_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.record("assigned")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.record("returned")
+
+        self.assertEqual(list(AssetHistory.objects.values_list("action_type", flat=True)), ["returned"])
+
+    def test_rolled_back_savepoints_keep_the_enclosing_buffer(self):
+        with CaptureQueriesContext(connection) as context, self.captureOnCommitCallbacks(execute=True):
+            self.record("assigned")
+            try:
+                with transaction.atomic():
+                    self.record("returned")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            with transaction.atomic():
+                self.record("repaired")
+            self.record("replaced")
+
+        self.assertCountEqual(
+            AssetHistory.objects.values_list("action_type", flat=True), ["assigned", "repaired", "replaced"]
+        )
+        # the savepoints that were released are written with the rest, in one batch
+        inserts = [
+            query for query in context.captured_queries if query["sql"].startswith('INSERT INTO "assets_assethistory"')
+        ]
+        self.assertEqual(len(inserts), 1)
+
+    def test_failed_inserts_are_logged(self):
+        with mock.patch("django.db.models.QuerySet.bulk_create", side_effect=DatabaseError("boom")):
+            with self.assertLogs("apps.assets.history", "ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.record("assigned")
+        self.assertFalse(AssetHistory.objects.exists())
+
+        # the surrounding transaction is still usable
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record("returned")
+        self.assertEqual(list(AssetHistory.objects.values_list("action_type", flat=True)), ["returned"])
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "history partitions are PostgreSQL only")
+    def test_month_without_a_partition(self):
+        table = AssetHistory._meta.db_table
+        month = partitions.month_start(timezone.now())
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE {connection.ops.quote_name(partitions.partition_name(table, month))}")
+
+        with self.assertLogs("apps.assets.history", "ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.record("assigned")
+        self.assertFalse(AssetHistory.objects.exists())
+
+        partitions.ensure_partitions()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record("returned")
+        self.assertEqual(list(AssetHistory.objects.values_list("action_type", flat=True)), ["returned"])
@@ -0,0 +1,124 @@
+"""
+One chronological timeline per asset.
+
+Assignments, returns, requests and maintenance requests are read as four
+streams, each ordered newest first on its ``(asset_id, timestamp, id)`` index
+and cut to one page past the cursor. ``heapq.merge`` interleaves them
+lazily, so a page reads at most ``4 * (limit + 1)`` rows however long the
+history is. Ties on the timestamp are broken by stream rank and then id,
+and the cursor is that ``(timestamp, rank, id)`` triple.
+"""
+
+import base64
+import binascii
+import heapq
+from collections import namedtuple
+from urllib import parse
+
+from django.db.models import F, Q, Value
+from django.utils.dateparse import parse_datetime
+
+from apps.assets.models import AssetAssignment, AssetRequest, AssetReturn, MaintenanceRequest
+from apps.core.pagination import RowComparison
+
+Stream = namedtuple("Stream", "kind model timestamp fields")
+Event = namedtuple("Event", "timestamp rank id instance")
+
+STREAMS = (
+    Stream("assignment", AssetAssignment, "created_at", ("approved_by",)),
+    Stream("return", AssetReturn, "created_at", ("comment",)),
+    Stream("request", AssetRequest, "created_at", ("status", "request_date", "comment")),
+    Stream("maintenance", MaintenanceRequest, "report_date", ("status", "description")),
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(event):
+    querystring = parse.urlencode(
+        {"t": event.timestamp.isoformat(), "r": event.rank, "i": event.id}
+    )
+    return base64.urlsafe_b64encode(querystring.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(encoded):
+    try:
+        decoded = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8")
+        tokens = parse.parse_qs(decoded)
+        timestamp = parse_datetime(tokens["t"][0])
+        rank = int(tokens["r"][0])
+        pk = int(tokens["i"][0])
+    except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+        raise InvalidCursor("Invalid cursor")
+    if timestamp is None:
+        raise InvalidCursor("Invalid cursor")
+    return timestamp, rank, pk
+
+
+def after_cursor(stream, rank, cursor):
+    """
+    The filter for the rows of ``stream`` that come after ``cursor`` in
+    timeline order.
+    """
+    timestamp, cursor_rank, pk = cursor
+    if rank < cursor_rank:
+        return Q(**{f"{stream.timestamp}__lte": timestamp})
+    if rank == cursor_rank:
+        return RowComparison(
+            [F(stream.timestamp), F("id")],
+            "<",
+            [Value(timestamp, output_field=stream.model._meta.get_field(stream.timestamp)), Value(pk)],
+        )
+    return Q(**{f"{stream.timestamp}__lt": timestamp})
+
+
+def read_stream(asset_id, rank, cursor, limit):
+    stream = STREAMS[rank]
+    queryset = (
+        stream.model.objects.filter(asset_id=asset_id)
+        .select_related("user")
+        .only("id", "uid", stream.timestamp, *stream.fields, "user__id", "user__uid", "user__username")
+        .order_by(f"-{stream.timestamp}", "-id")
+    )
+    if cursor is not None:
+        queryset = queryset.filter(after_cursor(stream, rank, cursor))
+    for instance in queryset[:limit]:
+        yield Event(getattr(instance, stream.timestamp), rank, instance.id, instance)
+
+
+def serialize_event(event):
+    stream = STREAMS[event.rank]
+    instance = event.instance
+    data = {
+        "type": stream.kind,
+        "uid": instance.uid,
+        "timestamp": event.timestamp,
+        "user": {
+            "id": instance.user.id,
+            "uid": instance.user.uid,
+            "name": instance.user.username,
+        },
+    }
+    for field in stream.fields:
+        data[field] = getattr(instance, field)
+    return data
+
+
+def asset_timeline(asset_id, cursor=None, limit=20):
+    """
+    Return one page of the timeline of ``asset_id`` and the cursor of the next.
+    """
+    if cursor is not None:
+        cursor = decode_cursor(cursor)
+
+    streams = [read_stream(asset_id, rank, cursor, limit + 1) for rank in range(len(STREAMS))]
+    merged = heapq.merge(*streams, key=lambda event: event[:3], reverse=True)
+
+    events = []
+    for event in merged:
+        if len(events) == limit:
+            return [serialize_event(event) for event in events], encode_cursor(events[-1])
+        events.append(event)
+    return [serialize_event(event) for event in events], None
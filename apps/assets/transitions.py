@@ -0,0 +1,201 @@
+"""
+State transitions for Asset.
+
+Each transition is one conditional ``UPDATE ... WHERE`` that only matches
+while the asset is still in the state the transition starts from. Two
+admins acting on the same asset at once cannot both succeed: the loser
+updates no rows and gets ``TransitionConflict``, without any row locks.
+
+    from apps.assets import transitions
+
+    transitions.assign(asset.id, user.id)
+
+Bulk endpoints use the ``*_many`` variants, which share the same rules.
+"""
+
+from collections import namedtuple
+
+from django.db.models import Case, Q, Value, When
+from django.dispatch import Signal
+from django.utils import timezone
+
+from apps.assets.models import Asset
+from apps.assets.registry import statuses
+from apps.core.response_cache import invalidate_models
+
+# Sent after a transition has been applied, inside the caller's transaction,
+# with ``asset_id``, ``transition`` and ``user_id``.
+asset_transitioned = Signal()
+
+# Sent by bulk writes that bypass model signals, inside the caller's
+# transaction: ``assets_created`` with ``asset_ids`` after a bulk insert and
+# ``asset_requests_decided`` with ``request_ids`` after pending requests were
+# approved or rejected in bulk.
+assets_created = Signal()
+asset_requests_decided = Signal()
+
+
+class TransitionError(Exception):
+    pass
+
+
+class TransitionConflict(TransitionError):
+    """
+    The asset was no longer in the state the transition starts from.
+    """
+
+
+def get_status(name):
+    asset_status = statuses.by_name(name)
+    if asset_status is None:
+        raise TransitionError("Asset status does not exist")
+    return asset_status
+
+
+# What a transition expects of the asset's row and what it changes on it.
+Rule = namedtuple("Rule", "expected changes")
+
+
+def apply(asset_id, transition, rule, user_id=None):
+    updated = (
+        Asset.objects.filter(rule.expected, id=asset_id)
+        .update(updated_at=timezone.now(), **rule.changes)
+    )
+    if not updated:
+        raise TransitionConflict(f"Asset cannot be {transition} in its current state")
+
+    invalidate_models([Asset])
+    asset_transitioned.send(
+        sender=Asset, asset_id=asset_id, transition=transition, user_id=user_id
+    )
+
+
+def apply_many(transition, rules, user_ids):
+    """
+    Apply ``transition`` to several assets with one UPDATE.
+
+    ``rules`` maps asset ids to their rule and ``user_ids`` to the user
+    acting on them; all rules share one guard. Assets that are not in the
+    starting state are left alone. Returns the ids of the ones that were.
+    """
+    if not rules:
+        return []
+
+    expected = next(iter(rules.values())).expected
+    # lock the matching rows so they still match when the UPDATE runs
+    matched = list(
+        Asset.objects.select_for_update()
+        .filter(expected, id__in=list(rules))
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if not matched:
+        return []
+
+    changes = {}
+    for field in rules[matched[0]].changes:
+        values = {asset_id: rules[asset_id].changes[field] for asset_id in matched}
+        if len(set(values.values())) == 1:
+            changes[field] = values[matched[0]]
+        else:
+            changes[field] = Case(
+                *[When(id=asset_id, then=Value(value)) for asset_id, value in values.items()]
+            )
+    Asset.objects.filter(id__in=matched).update(updated_at=timezone.now(), **changes)
+
+    invalidate_models([Asset])
+    for asset_id in matched:
+        asset_transitioned.send(
+            sender=Asset, asset_id=asset_id, transition=transition, user_id=user_ids[asset_id]
+        )
+    return matched
+
+
+def assign_rule(user_id):
+    return Rule(
+        expected=Q(status_id=get_status("ready-to-deploy").id, requestable=True),
+        changes={
+            "status_id": get_status("deployed").id,
+            "current_assignee_id": user_id,
+            "requestable": False,
+        },
+    )
+
+
+def assign(asset_id, user_id):
+    """
+    Deploy a requestable, ready-to-deploy asset to ``user_id``.
+    """
+    apply(asset_id, "assigned", assign_rule(user_id), user_id=user_id)
+
+
+def assign_many(assignments):
+    """
+    ``assign`` for several assets at once, ``assignments`` maps asset ids to user ids.
+
+    Returns the ids of the assets that were assigned.
+    """
+    rules = {asset_id: assign_rule(user_id) for asset_id, user_id in assignments.items()}
+    return apply_many("assigned", rules, user_ids=assignments)
+
+
+def release(asset_id, user_id):
+    """
+    Take a deployed asset back into stock.
+
+    Returns used to only clear the assignee and leave the asset "deployed",
+    where the request and assignment guards could never pick it up again.
+    A return now moves it to ready-to-deploy, and only a deployed asset can
+    be returned, so a second return of the same asset conflicts.
+    """
+    apply(
+        asset_id,
+        "returned",
+        Rule(
+            expected=Q(status_id=get_status("deployed").id),
+            changes={
+                "status_id": get_status("ready-to-deploy").id,
+                "current_assignee_id": None,
+                "requestable": True,
+            },
+        ),
+        user_id=user_id,
+    )
+
+
+# Statuses an asset can be sent for repair from.
+REPAIRABLE_STATUSES = ("ready-to-deploy", "deployed")
+
+
+def start_repair(asset_id, user_id):
+    apply(
+        asset_id,
+        "sent for repair",
+        Rule(
+            expected=Q(status_id__in=[get_status(name).id for name in REPAIRABLE_STATUSES]),
+            changes={"status_id": get_status("out for repair").id},
+        ),
+        user_id=user_id,
+    )
+
+
+def finish_repair(asset_id, user_id):
+    """
+    Bring a repaired asset back to deployed, or to stock if it had no assignee.
+    """
+    ready = get_status("ready-to-deploy")
+    deployed = get_status("deployed")
+    apply(
+        asset_id,
+        "repaired",
+        Rule(
+            expected=Q(status_id=get_status("out for repair").id),
+            changes={
+                "status_id": Case(
+                    When(current_assignee__isnull=True, then=Value(ready.id)),
+                    default=Value(deployed.id),
+                )
+            },
+        ),
+        user_id=user_id,
+    )
@@ -4,9 +4,33 @@ from django.shortcuts import get_object_or_404
 from rest_framework.decorators import action
 from rest_framework import viewsets,status,permissions
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from django.db import transaction
+from django.utils import timezone
 from apps.people.models import User
 from apps.people.permissions import TokenRequiredPermission,AdminCheckPermission
+from apps.assets.history import history_feed
+from apps.assets.timeline import InvalidCursor, asset_timeline
+from apps.core.filters import (
+    BooleanFilter,
+    DateRangeFilter,
+    DeclarativeFilterBackend,
+    Filter,
+    RangeFilter,
+    parse_number,
+)
+from apps.core.response_cache import invalidate_models
+from apps.core.mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    ExportMixin,
+    PaginatedListMixin,
+)
+from apps.assets import transitions
+from apps.assets.importers import AssetImporter
+from apps.assets.registry import asset_categories, has_status, statuses
+from apps.assets.search import FuzzyLookupMixin, search_assets
 from apps.assets.models import (
     Asset,
     AssetCategory,
@@ -49,95 +73,71 @@ from apps.assets.serializers import (
 )
 # Create your views here.
 
-class AssetCategoryViewSet(viewsets.ModelViewSet):
+class AssetCategoryViewSet(EagerLoadingMixin, ConditionalGetMixin, CachedListMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = AssetCategory.objects.all()
     serializer_class = AssetCategorySerializer
     permission_classes = [TokenRequiredPermission,AdminCheckPermission]
     lookup_field = "uid"
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
-class AssetStatusViewSet(viewsets.ModelViewSet):
+class AssetStatusViewSet(EagerLoadingMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = AssetStatus.objects.all()
     serializer_class = AssetStatusSerializer
     permission_classes = [TokenRequiredPermission,AdminCheckPermission]
     lookup_field = "uid"
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
 
-class SoftwareCategoryViewSet(viewsets.ModelViewSet):
+class SoftwareCategoryViewSet(EagerLoadingMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = SoftwareCategory.objects.all()
     serializer_class = SoftwareCategorySerializer
     permission_classes = [TokenRequiredPermission,AdminCheckPermission]
     lookup_field = "uid"
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
 
-class AssetViewset(viewsets.ModelViewSet):
+class AssetViewset(EagerLoadingMixin, ExportMixin, FuzzyLookupMixin, ConditionalGetMixin, CachedListMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = Asset.objects.all()
     permission_classes = [TokenRequiredPermission, AdminCheckPermission]
     lookup_field = "uid"
+    etag_dependencies = (AssetCategory, AssetStatus, AssetSupplier, User)
+    fuzzy_fields = ("serial_no", "tag", "model")
+    filter_backends = [DeclarativeFilterBackend]
+    filter_fields = {
+        "status": Filter("status_id", parse=int),
+        "category": Filter("category_id", parse=int),
+        "supplier": Filter("supplier_id", parse=int),
+        "current_assignee": Filter("current_assignee_id", parse=int),
+        "department": Filter("current_assignee__department_id", parse=int),
+        "purchase_date": DateRangeFilter("purchase_date"),
+        "purchase_price": RangeFilter("purchase_price", parse=parse_number),
+        "requestable": BooleanFilter("requestable"),
+        "condition": Filter("condition"),
+    }
+    export_fields = (
+        "uid",
+        "name",
+        "serial_no",
+        "tag",
+        "model",
+        "condition",
+        "category__name",
+        "status__name",
+        "supplier__name",
+        "current_assignee__username",
+        "requestable",
+        "order_number",
+        "purchase_date",
+        "purchase_price",
+        "created_at",
+        "updated_at",
+    )
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return AssetCreateUpdateSerializer
         return AssetListSerializer
     
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
     def create(self, request, *args, **kwargs):
         data = request.data
@@ -155,14 +155,14 @@ class AssetViewset(viewsets.ModelViewSet):
             data['image'] = request.FILES.get('image')
 
 
-        if not AssetCategory.objects.filter(id=data.get('category')).exists():
+        if asset_categories.by_id(data.get('category')) is None:
             return Response(
                 {"success": False, "info": "Asset category does not exist"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
 
-        if not AssetStatus.objects.filter(id=data.get('status')).exists():
+        if statuses.by_id(data.get('status')) is None:
             return Response(
                 {"success": False, "info": "Asset status does not exist"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -181,55 +181,106 @@ class AssetViewset(viewsets.ModelViewSet):
             {"success": True, "info": "Asset added successfully"}, status=status.HTTP_201_CREATED
         )
     
+    @action(detail=False, methods=["post"], permission_classes=[TokenRequiredPermission, AdminCheckPermission], url_path='bulk-import')
+    def bulk_import(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response(
+                {"success": False, "info": "file is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not upload.name.lower().endswith(".csv"):
+            return Response(
+                {"success": False, "info": "Only CSV files are supported"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = AssetImporter(upload).run()
+        return Response(
+            {"success": not report["errors"], "info": report},
+            status=status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, methods=["get"], permission_classes=[TokenRequiredPermission, AdminCheckPermission], url_path='search')
+    def search(self, request, *args, **kwargs):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"success": False, "info": "q is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            return Response(
+                {"success": False, "info": "limit must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if limit < 1:
+            return Response(
+                {"success": False, "info": "limit must be at least 1"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = search_assets(self.filter_queryset(self.get_queryset()), text)[:limit]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response({"success": True, "info": serializer.data}, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=["get"], permission_classes=[TokenRequiredPermission], url_path='asset-history')
     def asset_history(self, request, *args, **kwargs):
-        asset_uid = kwargs.get('asset_uid')
+        asset_uid = kwargs.get('uid')
         if not asset_uid:
             return Response({"success": False, "info": "Asset UID not provided"}, status=status.HTTP_400_BAD_REQUEST)
         
         asset = get_object_or_404(Asset, uid=asset_uid)
-        queryset = Asset.objects.filter(asset=asset)
-        serializer = AssetHistoryListSerializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
+        return history_feed(self, AssetHistory.objects.filter(asset=asset), AssetHistoryListSerializer)
 
 
+    @action(detail=True, methods=["get"], permission_classes=[TokenRequiredPermission], url_path='timeline')
+    def timeline(self, request, *args, **kwargs):
+        asset = get_object_or_404(Asset.objects.only("id"), uid=kwargs.get('uid'))
+        try:
+            events, cursor = asset_timeline(
+                asset.id,
+                cursor=request.query_params.get("cursor") or None,
+                limit=self.paginator.get_page_size(request),
+            )
+        except InvalidCursor as e:
+            return Response({"success": False, "info": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        next_link = None
+        if cursor is not None:
+            next_link = replace_query_param(request.build_absolute_uri(), "cursor", cursor)
+        return Response({"success": True, "info": events, "next": next_link}, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=["get"], permission_classes=[TokenRequiredPermission], url_path='all-asset-histories')
     def all_asset_histories(self, request, *args, **kwargs):
-        queryset = Asset.objects.all()
-        serializer = AssetHistoryListSerializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
+        return history_feed(self, AssetHistory.objects.all(), AssetHistoryListSerializer)
     
     
 
 
-class AssetRequestViewSet(viewsets.ModelViewSet):
+class AssetRequestViewSet(EagerLoadingMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = AssetRequest.objects.all()
     permission_classes = [TokenRequiredPermission]
     lookup_field = "uid"
+    etag_dependencies = (Asset, User)
+    filter_backends = [DeclarativeFilterBackend]
+    filter_fields = {
+        "status": Filter("status"),
+        "user": Filter("user_id", parse=int),
+        "asset": Filter("asset_id", parse=int),
+        "request_date": DateRangeFilter("request_date"),
+        "created_at": DateRangeFilter("created_at", datetime_field=True),
+    }
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return AssetRequestCreateUpdateSerializer
         return AssetRequestListSerializer
     
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
     def create(self, request, *args, **kwargs):
         data = request.data
@@ -258,13 +309,14 @@ class AssetRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        if not asset.requestable or not asset.status.name == "ready-to-deploy":
+        ready_to_deploy = has_status(asset, "ready-to-deploy")
+        if not asset.requestable or not ready_to_deploy:
             return Response(
                 {"success": False, "info": "Asset is not requestable at this time"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        if asset.requestable and not asset.status.name == "ready-to-deploy":
+        if asset.requestable and not ready_to_deploy:
             return Response(
                 {"success": False, "info": "Asset not ready to deploy"},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -303,15 +355,11 @@ class AssetRequestViewSet(viewsets.ModelViewSet):
         if request_status == "approved":
             try:
                 with transaction.atomic():
-                    asset = asset_request.asset
-                    asset.status = AssetStatus.objects.get(name="deployed")
-                    asset.current_assignee = asset_request.user
-                    asset.requestable = False
-                    asset.save(update_fields=['status', 'current_assignee', 'requestable'])
-                    
+                    transitions.assign(asset_request.asset_id, asset_request.user_id)
+
                     AssetAssignment.objects.create(
-                        asset=asset_request.asset,
-                        user=asset_request.user,
+                        asset_id=asset_request.asset_id,
+                        user_id=asset_request.user_id,
                         approved_by = request.user.username,
                     )
                     
@@ -320,7 +368,13 @@ class AssetRequestViewSet(viewsets.ModelViewSet):
                     asset_request.save(update_fields=['status', 'approval_date'])
 
                 return Response({"success": True, "info": "Asset request approved successfully"}, status=status.HTTP_200_OK)
-            
+
+            except transitions.TransitionConflict:
+                return Response({"success": False, "info": "Asset is not requestable at this time"}, status=status.HTTP_409_CONFLICT)
+
+            except transitions.TransitionError as e:
+                return Response({"success": False, "info": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
             except Exception as e:
                 return Response({"success": False, "info": "Failed to approve asset request: " + str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -332,35 +386,128 @@ class AssetRequestViewSet(viewsets.ModelViewSet):
         
         else:
             return Response({"success": False, "info": "Invalid status provided"}, status=status.HTTP_400_BAD_REQUEST)
-        
-        
 
+    @action(detail=False, methods=["post"], permission_classes=[TokenRequiredPermission, AdminCheckPermission], url_path='bulk-approval')
+    def bulk_approval(self, request, *args, **kwargs):
+        items = request.data.get('items')
+        if not isinstance(items, list) or not items:
+            return Response({"success": False, "info": "items must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+
+        outcomes = []
+        decisions = {}
+        for item in items:
+            asset_request_id = item.get('asset_request') if isinstance(item, dict) else None
+            request_status = item.get('status') if isinstance(item, dict) else None
+            outcome = {"asset_request": asset_request_id, "status": request_status}
+            outcomes.append(outcome)
+            if not asset_request_id:
+                outcome.update(success=False, info="Asset Request ID not provided")
+            elif not str(asset_request_id).isdigit():
+                outcome.update(success=False, info="Invalid Asset Request ID provided")
+            elif request_status not in ["approved", "rejected"]:
+                outcome.update(success=False, info="Invalid status provided")
+            elif int(asset_request_id) in decisions:
+                outcome.update(success=False, info="Asset request appears more than once")
+            else:
+                decisions[int(asset_request_id)] = outcome
+
+        now = timezone.now()
+        today = now.date()
+        try:
+            with transaction.atomic():
+                asset_requests = {
+                    asset_request.id: asset_request
+                    for asset_request in AssetRequest.objects.select_for_update().filter(id__in=list(decisions))
+                }
+
+                updated_requests = []
+                approvals = {}
+                for asset_request_id, outcome in decisions.items():
+                    asset_request = asset_requests.get(asset_request_id)
+                    if asset_request is None:
+                        outcome.update(success=False, info="Asset request does not exist")
+                        continue
+                    if asset_request.status != "pending":
+                        outcome.update(success=False, info=f"Asset request already {asset_request.status}")
+                        continue
+
+                    if outcome["status"] == "rejected":
+                        asset_request.status = "rejected"
+                        asset_request.rejection_date = today
+                        asset_request.updated_at = now
+                        updated_requests.append(asset_request)
+                        outcome.update(success=True, info="Asset request rejected successfully")
+                        continue
+
+                    # the first approval of an asset wins, the others find it deployed
+                    approvals.setdefault(asset_request.asset_id, asset_request)
+                    if approvals[asset_request.asset_id] is not asset_request:
+                        outcome.update(success=False, info="Asset is not requestable at this time")
+
+                assigned = set(
+                    transitions.assign_many(
+                        {asset_id: asset_request.user_id for asset_id, asset_request in approvals.items()}
+                    )
+                )
 
+                assignments = []
+                for asset_id, asset_request in approvals.items():
+                    outcome = decisions[asset_request.id]
+                    if asset_id not in assigned:
+                        outcome.update(success=False, info="Asset is not requestable at this time")
+                        continue
+
+                    assignments.append(
+                        AssetAssignment(
+                            asset_id=asset_id,
+                            user_id=asset_request.user_id,
+                            approved_by=request.user.username,
+                        )
+                    )
+
+                    asset_request.status = "approved"
+                    asset_request.approval_date = today
+                    asset_request.updated_at = now
+                    updated_requests.append(asset_request)
+                    outcome.update(success=True, info="Asset request approved successfully")
+
+                AssetRequest.objects.bulk_update(updated_requests, ["status", "approval_date", "rejection_date", "updated_at"])
+                AssetAssignment.objects.bulk_create(assignments)
+                invalidate_models([AssetRequest, AssetAssignment])
+                transitions.asset_requests_decided.send(
+                    sender=AssetRequest, request_ids=[asset_request.id for asset_request in updated_requests]
+                )
+        except transitions.TransitionError as e:
+            return Response({"success": False, "info": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class AssetAssignmentViewSet(viewsets.ModelViewSet):
+        return Response(
+            {"success": all(outcome["success"] for outcome in outcomes), "info": outcomes},
+            status=status.HTTP_200_OK,
+        )
+
+
+
+class AssetAssignmentViewSet(EagerLoadingMixin, ExportMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = AssetAssignment.objects.all()
     permission_classes = [TokenRequiredPermission, AdminCheckPermission]
     lookup_field = "uid"
+    etag_dependencies = (Asset, User)
+    export_fields = (
+        "uid",
+        "asset__uid",
+        "asset__name",
+        "asset__serial_no",
+        "user__uid",
+        "user__username",
+        "approved_by",
+        "created_at",
+    )
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return AssetAssignmentCreateUpdateSerializer
         return AssetAssignmentListSerializer
     
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
     def create(self, request, *args, **kwargs):
         data = request.data
         required_fields = ["user", "asset"]
@@ -379,41 +526,46 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        if not asset.requestable or not asset.status.name == "ready-to-deploy":
+        ready_to_deploy = has_status(asset, "ready-to-deploy")
+        if not asset.requestable or not ready_to_deploy:
             return Response(
                 {"success": False, "info": "Asset is not requestable at this time"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        if asset.requestable and not asset.status.name == "ready-to-deploy":
+        if asset.requestable and not ready_to_deploy:
             return Response(
                 {"success": False, "info": "Asset not ready to deploy"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
 
-        user = User.objects.get(id=data.get('user'))
+        user = User.objects.filter(id=data.get('user')).first()
         if not user:
             return Response(
                 {"success": False, "info": "User does not exist"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        
-        stat = AssetStatus.objects.get(name="deployed")
-        if not stat:
-            return Response(
-                {"success": False, "info": "Asset status does not exist"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        asset.current_assignee = user
-        asset.requestable = False
-        asset.status = stat
-        asset.save(update_fields=['current_assignee', 'requestable', 'status'])
-        
+
         data['approved_by'] = request.user.username
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+
+        try:
+            with transaction.atomic():
+                transitions.assign(asset.id, user.id)
+                self.perform_create(serializer)
+        except transitions.TransitionConflict:
+            return Response(
+                {"success": False, "info": "Asset is not requestable at this time"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except transitions.TransitionError as e:
+            return Response(
+                {"success": False, "info": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         return Response(
             {"success": True, "info": "Asset assignment added successfully"}, status=status.HTTP_201_CREATED
         )
@@ -425,7 +577,9 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
             return Response({"success": False, "info": "Asset UID not provided"}, status=status.HTTP_400_BAD_REQUEST)
         
         asset = get_object_or_404(Asset, uid=asset_uid)
-        queryset = AssetAssignment.objects.filter(asset=asset)
+        queryset = AssetAssignmentHistorySerializer.setup_eager_loading(
+            AssetAssignment.objects.filter(asset=asset)
+        )
         serializer = AssetAssignmentHistorySerializer(queryset, many=True)
         return Response(
             {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
@@ -434,37 +588,36 @@ class AssetAssignmentViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"], permission_classes=[TokenRequiredPermission], url_path='all-assignment-histories')
     def all_asset_assignment_history(self, request, *args, **kwargs):
-        queryset = AssetAssignment.objects.all()
+        queryset = AssetAssignmentHistorySerializer.setup_eager_loading(
+            AssetAssignment.objects.all()
+        )
         serializer = AssetAssignmentHistorySerializer(queryset, many=True)
         return Response(
             {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
         )
 
 
-class AssetReturnViewSet(viewsets.ModelViewSet):
+class AssetReturnViewSet(EagerLoadingMixin, ExportMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = AssetReturn.objects.all()
     permission_classes = [TokenRequiredPermission]
     lookup_field = "uid"
+    etag_dependencies = (Asset, User)
+    export_fields = (
+        "uid",
+        "asset__uid",
+        "asset__name",
+        "asset__serial_no",
+        "user__uid",
+        "user__username",
+        "comment",
+        "created_at",
+    )
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return AssetReturnCreateUpdateSerializer
         return AssetReturnListSerializer
     
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
     def create(self, request, *args, **kwargs):
         data = request.data
@@ -497,24 +650,42 @@ class AssetReturnViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        asset.current_assignee = None
-        asset.requestable = True
-        asset.save(update_fields=['current_assignee', 'requestable'])
-        
-
-
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+
+        try:
+            with transaction.atomic():
+                transitions.release(asset.id, user_id)
+                self.perform_create(serializer)
+        except transitions.TransitionConflict:
+            return Response(
+                {"success": False, "info": "Asset is not deployed"},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except transitions.TransitionError as e:
+            return Response(
+                {"success": False, "info": str(e)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         return Response(
             {"success": True, "info": "Asset return added successfully"}, status=status.HTTP_201_CREATED
         )
     
 
-class MaintenanceRequestViewSet(viewsets.ModelViewSet):
+class MaintenanceRequestViewSet(EagerLoadingMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = MaintenanceRequest.objects.all()
     permission_classes = [TokenRequiredPermission]
     lookup_field = "uid"
+    etag_dependencies = (Asset, User)
+    cursor_field = "report_date"
+    filter_backends = [DeclarativeFilterBackend]
+    filter_fields = {
+        "status": Filter("status"),
+        "user": Filter("user_id", parse=int),
+        "asset": Filter("asset_id", parse=int),
+        "report_date": DateRangeFilter("report_date", datetime_field=True),
+    }
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -522,20 +693,6 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
         return MaintenanceRequestListSerializer
     
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
     def create(self, request, *args, **kwargs):
         data = request.data
@@ -591,38 +748,43 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
             return Response({"success": False, "info": "Maintenance Status not provided"}, status=status.HTTP_400_BAD_REQUEST)
         
         
+        if maintenance_status not in ["pending", "in-progress", "completed"]:
+            return Response({"success": False, "info": "Invalid status provided"}, status=status.HTTP_400_BAD_REQUEST)
+
         maintenance_request = get_object_or_404(MaintenanceRequest, id=maintenance_id)
-        maintenance_request.status = maintenance_status
-        maintenance_request.save(update_fields=['status'])
+        if maintenance_request.status == maintenance_status:
+            return Response({"success": True, "info": "Maintenance request updated successfully"}, status=status.HTTP_200_OK)
+
+        try:
+            with transaction.atomic():
+                if maintenance_status == "in-progress":
+                    transitions.start_repair(maintenance_request.asset_id, request.user.id)
+                elif maintenance_status == "completed" and maintenance_request.status == "in-progress":
+                    transitions.finish_repair(maintenance_request.asset_id, request.user.id)
+
+                maintenance_request.status = maintenance_status
+                maintenance_request.save(update_fields=['status', 'updated_at'])
+        except transitions.TransitionConflict as e:
+            return Response({"success": False, "info": str(e)}, status=status.HTTP_409_CONFLICT)
+        except transitions.TransitionError as e:
+            return Response({"success": False, "info": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({"success": True, "info": "Maintenance request updated successfully"}, status=status.HTTP_200_OK)
 
-class AssetSupplierViewSet(viewsets.ModelViewSet):
+class AssetSupplierViewSet(EagerLoadingMixin, FuzzyLookupMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = AssetSupplier.objects.all()
     permission_classes = [TokenRequiredPermission,AdminCheckPermission]
     lookup_field = "uid"
     serializer_class = AssetSupplierSerializer
+    fuzzy_fields = ("name",)
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
 
 
-class SoftwareLicencesViewSet(viewsets.ModelViewSet):
+class SoftwareLicencesViewSet(EagerLoadingMixin, FuzzyLookupMixin, ConditionalGetMixin, CachedListMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = SoftwareLicences.objects.all()
     permission_classes = [TokenRequiredPermission,AdminCheckPermission]
     lookup_field = "uid"
+    fuzzy_fields = ("name",)
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -630,20 +792,6 @@ class SoftwareLicencesViewSet(viewsets.ModelViewSet):
         return SoftwareLicencesListSerializer
     
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
     def create(self, request, *args, **kwargs):
         data = request.data
         required_fields = ["name", "product_key", "category", "purchase_date"]
@@ -665,10 +813,20 @@ class SoftwareLicencesViewSet(viewsets.ModelViewSet):
 
     
 
-class LicenceCheckoutViewset(viewsets.ModelViewSet):
+class LicenceCheckoutViewset(EagerLoadingMixin, ExportMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = LicenseCheckout.objects.all()
     permission_classes = [TokenRequiredPermission,AdminCheckPermission]
     lookup_field = "uid"
+    etag_dependencies = (SoftwareLicences, User)
+    export_fields = (
+        "uid",
+        "licence__uid",
+        "licence__name",
+        "user__uid",
+        "user__username",
+        "checkout_date",
+        "created_at",
+    )
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
@@ -676,20 +834,6 @@ class LicenceCheckoutViewset(viewsets.ModelViewSet):
         return LicenseCheckoutListSerializer
     
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-    
     def validate_related_fields(self, data):
         related_fields = {
             "user": User,
@@ -728,8 +872,4 @@ class LicenceCheckoutViewset(viewsets.ModelViewSet):
     
     @action(detail=False,methods=['get'],permission_classes=[TokenRequiredPermission],url_path='license-checkout-history')
     def license_checkout_history(self,request,pk=None):
-        queryset = LicenseHistory.objects.all()
-        serializer = LicenseHistoryListSerializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
\ No newline at end of file
+        return history_feed(self, LicenseHistory.objects.all(), LicenseHistoryListSerializer)
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Per-transaction write buffers, flushed when the transaction commits.
+
+    buffer = transaction_buffer("history_buffer", HistoryBuffer)
+    buffer.rows[model].append(row)
+
+The first call inside a transaction or savepoint creates a buffer with
+``factory(using)`` and registers a hook with ``transaction.on_commit``;
+later calls in the same savepoint get the same buffer back. Django drops
+the callbacks of a savepoint that rolls back, and the connection only keeps
+a weak reference to each hook, so the rows a rolled-back savepoint buffered
+go with it while the enclosing buffers are untouched. At commit the first
+hook to run merges the buffers that are left with ``merge(other)`` and
+flushes them in one go.
+"""
+
+import weakref
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+class CommitHook:
+    def __init__(self, buffer, name, using):
+        self.buffer = buffer
+        self.name = name
+        self.using = using
+        self.called = False
+
+    def __call__(self):
+        if self.called:
+            return
+        connection = connections[self.using]
+        hooks = live_buffers(connection, self.name)
+        setattr(connection, self.name, None)
+
+        self.called = True
+        for hook in hooks.values():
+            if hook is not self:
+                hook.called = True
+                self.buffer.merge(hook.buffer)
+        self.buffer.flush()
+
+
+def live_buffers(connection, name):
+    """
+    The hooks of ``name`` still waiting for the commit, by savepoint.
+    """
+    hooks = {}
+    for savepoint, hook_ref in (getattr(connection, name, None) or {}).items():
+        hook = hook_ref()
+        if hook is not None and not hook.called:
+            hooks[savepoint] = hook
+    return hooks
+
+
+def transaction_buffer(name, factory, using=DEFAULT_DB_ALIAS):
+    """
+    The ``name`` buffer of the current savepoint, or transaction, on
+    ``using``; only call it inside an atomic block, outside one on_commit
+    flushes at once.
+    """
+    connection = connections[using]
+    # atomic(savepoint=False) blocks record None; they share the enclosing buffer
+    savepoint = next((sid for sid in reversed(connection.savepoint_ids) if sid), None)
+    hook_ref = (getattr(connection, name, None) or {}).get(savepoint)
+    hook = hook_ref() if hook_ref is not None else None
+    if hook is not None and not hook.called:
+        return hook.buffer
+
+    buffer = factory(using)
+    hook = CommitHook(buffer, name, using)
+    hooks = {key: weakref.ref(live) for key, live in live_buffers(connection, name).items()}
+    hooks[savepoint] = weakref.ref(hook)
+    setattr(connection, name, hooks)
+    transaction.on_commit(hook, using=using)
+    return buffer
@@ -0,0 +1,358 @@
+import csv
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from apps.core import response_cache
+
+
+class PaginatedListMixin:
+    """
+    Shared ``list`` for the ViewSets.
+
+    Pages the filtered queryset through the configured pagination class and
+    keeps the ``{"success", "info"}`` envelope used across the API.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(
+            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
+        )
+
+
+def parse_fieldset(query_params):
+    """
+    Parse ``?fields=`` and ``?expand=`` into ``(fields, nested)``.
+
+    ``fields=uid,tag,status.name`` selects the top-level ``uid``, ``tag`` and
+    ``status`` fields and trims the nested ``status`` object to ``name``.
+    ``expand=supplier`` adds ``supplier`` to the selection with its nested
+    object kept whole. ``fields`` is None when no selection was asked for.
+    """
+    requested = [
+        path.strip() for path in query_params.get("fields", "").split(",") if path.strip()
+    ]
+    if not requested:
+        return None, {}
+
+    fields, nested = set(), {}
+    for path in requested:
+        name, _, key = path.partition(".")
+        fields.add(name)
+        if key:
+            nested.setdefault(name, set()).add(key)
+
+    for name in query_params.get("expand", "").split(","):
+        name = name.strip()
+        if name:
+            fields.add(name)
+            nested.pop(name, None)
+
+    return fields, nested
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validation for ``list`` and ``retrieve``.
+
+    The list ETag hashes the response cache's tag versions of the view's
+    model and its ``etag_dependencies`` (other models whose rows appear
+    nested in the payload), the request's query string and the caller's
+    role. Every committed write to those models replaces a version, so no
+    table is read to validate. The detail validator is the instance's
+    ``updated_at`` plus the dependency versions. When the client's validator
+    still matches, a 304 is returned before anything is serialized.
+    """
+
+    etag_dependencies = ()
+
+    def get_tag_versions(self, models):
+        return response_cache.get_tag_versions(
+            [response_cache.model_tag(model) for model in models]
+        )
+
+    def get_etag(self, state):
+        # the payload can depend on the caller's role, so the ETag does too
+        role = getattr(self.request.user, "role", None)
+        raw = json.dumps(
+            [self.basename, self.request.get_full_path(), role.name if role else None, state],
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        )
+        return quote_etag(hashlib.md5(raw.encode("utf-8")).hexdigest())
+
+    def is_not_modified(self, etag, last_modified):
+        if_none_match = self.request.headers.get("If-None-Match")
+        if if_none_match:
+            etags = [tag.removeprefix("W/") for tag in parse_etags(if_none_match)]
+            return "*" in etags or etag in etags
+
+        if_modified_since = self.request.headers.get("If-Modified-Since")
+        if if_modified_since and last_modified:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(last_modified.timestamp()) <= since
+
+        return False
+
+    def conditional_response(self, state, render, last_modified=None):
+        etag = self.get_etag(state)
+        if self.is_not_modified(etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = render()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        state = self.get_tag_versions((self.queryset.model, *self.etag_dependencies))
+        return self.conditional_response(
+            state, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        state = [instance.updated_at, self.get_tag_versions(self.etag_dependencies)]
+
+        def render():
+            serializer = self.get_serializer(instance)
+            return Response(
+                {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
+            )
+
+        # nested rows from the dependencies can change without touching updated_at
+        last_modified = None if self.etag_dependencies else instance.updated_at
+        return self.conditional_response(state, render, last_modified=last_modified)
+
+
+class CachedListMixin:
+    """
+    Serves ``list`` from the response cache.
+
+    The entry is tagged with the view's model and its ``etag_dependencies``,
+    and keyed by the full URL and the caller's role.
+    """
+
+    etag_dependencies = ()
+
+    def get_cache_tags(self):
+        models = (self.queryset.model, *self.etag_dependencies)
+        return [response_cache.model_tag(model) for model in models]
+
+    def get_list_cache_key(self):
+        role = getattr(self.request.user, "role", None)
+        tags = self.get_cache_tags()
+        return response_cache.build_key(
+            self.basename,
+            self.request.build_absolute_uri(),
+            role.name if role else None,
+            tags,
+            response_cache.get_tag_versions(tags),
+        )
+
+    def list(self, request, *args, **kwargs):
+        def compute():
+            return super(CachedListMixin, self).list(request, *args, **kwargs).data
+
+        data = response_cache.get_or_compute(self.get_list_cache_key(), compute)
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class EagerLoadingSerializerMixin:
+    """
+    Lets a serializer declare the relations it reads.
+
+    ``related_fields`` maps a ``select_related`` path to the columns the
+    serializer touches on it, e.g. ``{"category": ("id", "uid", "name")}``.
+    ``field_sources`` lists extra fields a method field reads, e.g.
+    ``{"status": ("asset",)}``. ``setup_eager_loading`` turns these into one
+    joined query. When ``fields`` is given, it reads only those columns and
+    the relations they need. Columns in ``deferred_fields`` are never read.
+    """
+
+    related_fields = {}
+    field_sources = {}
+    deferred_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        if fields is None:
+            relations = cls.related_fields
+            if not relations and not cls.deferred_fields:
+                return queryset
+        else:
+            fields = set(fields)
+            for name in list(fields):
+                fields.update(cls.field_sources.get(name, ()))
+            relations = {
+                relation: columns
+                for relation, columns in cls.related_fields.items()
+                if relation.split("__")[0] in fields
+            }
+
+        local_fields = [
+            field.name
+            for field in queryset.model._meta.concrete_fields
+            if (fields is None or field.name in fields)
+            and field.name not in cls.deferred_fields
+        ]
+        related_columns = [
+            f"{relation}__{column}"
+            for relation, columns in relations.items()
+            for column in columns
+        ]
+        if relations:
+            # select_related() with no arguments would follow every FK
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*local_fields, *related_columns)
+
+
+class SparseFieldsetSerializerMixin(EagerLoadingSerializerMixin):
+    """
+    Prunes the serializer to the ``?fields=`` / ``?expand=`` selection on reads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.nested_fieldset = {}
+
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        fields, nested = parse_fieldset(request.query_params)
+        if fields is None:
+            return
+
+        for name in set(self.fields) - fields:
+            self.fields.pop(name)
+        self.nested_fieldset = nested
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name, keys in self.nested_fieldset.items():
+            value = data.get(name)
+            if isinstance(value, dict):
+                data[name] = {key: value[key] for key in value if key in keys}
+        return data
+
+
+class EagerLoadingMixin:
+    """
+    Applies the serializer's ``setup_eager_loading`` to ``get_queryset``.
+
+    On reads with a ``?fields=`` selection, only the selected columns are
+    loaded, plus the ones the view itself relies on (pk, lookup and cursor).
+    """
+
+    def get_selected_fields(self):
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return None
+
+        fields, _ = parse_fieldset(self.request.query_params)
+        if fields is None:
+            return None
+
+        # pk, lookup, cursor and conditional GET columns are always needed
+        required = {
+            "id",
+            "updated_at",
+            self.lookup_field,
+            getattr(self, "cursor_field", "created_at"),
+        }
+        return fields | required
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "setup_eager_loading"):
+            queryset = serializer_class.setup_eager_loading(
+                queryset, fields=self.get_selected_fields()
+            )
+        return queryset
+
+
+class Echo:
+    """
+    File-like object whose ``write`` hands the value back to ``csv.writer``.
+    """
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+class ExportMixin:
+    """
+    Adds ``export/``, streaming the filtered list as CSV or NDJSON.
+
+    Rows are read through a server-side cursor as ``values()`` dicts limited
+    to ``export_fields``. Nothing is accumulated in memory, and the first
+    chunk is sent as soon as the cursor returns it. Pick the format with
+    ``?output=csv`` (default) or ``?output=ndjson``.
+    """
+
+    export_fields = ()
+    export_chunk_size = 2000
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        output = request.query_params.get("output", "csv")
+        if output not in ("csv", "ndjson"):
+            return Response(
+                {"success": False, "info": "output must be csv or ndjson"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fields = list(self.export_fields)
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values(*fields)
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+
+        if output == "csv":
+            response = StreamingHttpResponse(
+                stream_csv(rows, fields), content_type="text/csv"
+            )
+        else:
+            response = StreamingHttpResponse(
+                stream_ndjson(rows), content_type="application/x-ndjson"
+            )
+
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}.{output}"'
+        )
+        return response
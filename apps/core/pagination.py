@@ -0,0 +1,198 @@
+import base64
+import binascii
+from urllib import parse
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BooleanField, F, Func, Value
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowComparison(Func):
+    """
+    ``(a, b) < (x, y)`` as a single row-value comparison.
+
+    Unlike ``a < x OR (a = x AND b < y)`` the planner can answer it with one
+    range scan over an index on ``(a, b)``.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, columns, operator, values):
+        self.operator = operator
+        super().__init__(*columns, *values)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        parts, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            parts.append(sql)
+            params.extend(expression_params)
+        half = len(parts) // 2
+        sql = f"({', '.join(parts[:half])}) {self.operator} ({', '.join(parts[half:])})"
+        return sql, params
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on ``(cursor_field, id)``.
+
+    Pages are fetched with a ``WHERE (cursor_field, id) < (value, pk)`` seek
+    instead of an OFFSET, so page 10 000 costs the same as page 1. Views can
+    override ``cursor_field`` when their ordering column is not ``created_at``.
+    """
+
+    cursor_field = "created_at"
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.cursor_field = getattr(view, "cursor_field", self.cursor_field)
+        field = queryset.model._meta.get_field(self.cursor_field)
+        cursor = self.decode_cursor(request, field)
+        reverse = cursor is not None and cursor[0]
+
+        results = list(self.page_queryset(queryset, cursor)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = results
+        return results
+
+    def page_queryset(self, queryset, cursor=None):
+        """
+        ``queryset`` ordered by ``(cursor_field, id)`` and seeked past
+        ``cursor``, a decoded ``(reverse, value, pk)``; slice it for a page.
+        """
+        field = queryset.model._meta.get_field(self.cursor_field)
+        if cursor is None:
+            return queryset.order_by(f"-{field.name}", "-id")
+
+        reverse, value, pk = cursor
+        seek = RowComparison(
+            [F(field.name), F("id")],
+            ">" if reverse else "<",
+            [Value(value, output_field=field), Value(pk)],
+        )
+        if reverse:
+            return queryset.filter(seek).order_by(field.name, "id")
+        return queryset.filter(seek).order_by(f"-{field.name}", "-id")
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request, field):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8")
+            tokens = parse.parse_qs(decoded, keep_blank_values=True)
+            reverse = tokens["r"][0] == "1"
+            value = field.to_python(tokens["v"][0])
+            pk = int(tokens["i"][0])
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            UnicodeError,
+            binascii.Error,
+            DjangoValidationError,
+        ):
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+
+        if value is None:
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return reverse, value, pk
+
+    def encode_cursor(self, instance, reverse):
+        value = getattr(instance, self.cursor_field)
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+
+        querystring = parse.urlencode(
+            {"r": "1" if reverse else "0", "v": value, "i": instance.pk}
+        )
+        encoded = base64.urlsafe_b64encode(querystring.encode("utf-8")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "success": True,
+                "info": data,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["success", "info"],
+            "properties": {
+                "success": {"type": "boolean"},
+                "info": schema,
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
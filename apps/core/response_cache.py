@@ -0,0 +1,89 @@
+"""
+Cache-aside storage for serialized list responses.
+
+Entries are keyed by view, full URL and the caller's role, plus the current
+version of every model tag the response depends on. Saving or deleting a
+row replaces the version token of its model's tag. Every entry built from
+the old version then stops being addressed and simply expires.
+"""
+
+import hashlib
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+RESPONSE_CACHE_TIMEOUT = 300
+LOCK_TIMEOUT = 30
+WAIT_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+
+
+def model_tag(model):
+    return model._meta.label_lower
+
+
+def tag_version_key(tag):
+    return f"cachetag:{tag}"
+
+
+def get_tag_versions(tags):
+    keys = [tag_version_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_tags(tags):
+    cache.set_many({tag_version_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None)
+
+
+def invalidate_models(models):
+    """
+    Bump the tags of ``models`` once the current transaction commits.
+
+    Bulk writes and queryset updates send no model signals, so the code doing
+    them calls this directly.
+    """
+    tags = [model_tag(model) for model in models]
+    transaction.on_commit(lambda: bump_tags(tags))
+
+
+def build_key(*parts):
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+    return f"response:{digest}"
+
+
+def get_or_compute(key, compute, timeout=RESPONSE_CACHE_TIMEOUT):
+    """
+    Return the cached value for ``key``, computing it at most once at a time.
+
+    The caller that wins the lock recomputes; concurrent callers poll for the
+    result instead of stampeding the database. If the winner has not
+    finished within ``WAIT_TIMEOUT`` they compute it themselves.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, value, timeout=timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+    return compute()
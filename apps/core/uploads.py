@@ -0,0 +1,18 @@
+import codecs
+import csv
+
+
+def read_csv_rows(upload):
+    """
+    Yield ``(line, row)`` for each row of an uploaded CSV file.
+
+    Line numbers count the header as line 1, as spreadsheets show them.
+    Empty cells are left out so optional fields fall back to their defaults.
+    """
+    reader = csv.DictReader(codecs.iterdecode(upload, "utf-8-sig"))
+    for line, row in enumerate(reader, start=2):
+        yield line, {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key is not None and value and value.strip()
+        }
@@ -0,0 +1,41 @@
+"""
+Queues notification emails for delivery by a Celery worker.
+
+Emails are stored with post_office at ``medium`` priority so nothing is sent
+in the request. Delivery is scheduled once the surrounding transaction
+commits, so a rolled back request never sends mail and workers never look
+for rows that are not visible yet.
+
+    from apps.notifications.dispatch import queue_notification
+
+    queue_notification(user.email, "otp", {"otp": otp})
+"""
+
+from django.conf import settings
+from django.db import transaction
+from post_office import mail
+
+from apps.notifications.tasks import dispatch_emails
+
+
+def queue_notifications(messages):
+    """
+    Queue ``(recipient, template, context)`` messages for one delivery task.
+    """
+    email_ids = [
+        mail.send(
+            recipient,
+            settings.DEFAULT_FROM_EMAIL,
+            template=template,
+            context=context,
+            priority="medium",
+        ).id
+        for recipient, template, context in messages
+    ]
+    if email_ids:
+        transaction.on_commit(lambda: dispatch_emails.delay(email_ids))
+    return email_ids
+
+
+def queue_notification(recipient, template, context=None):
+    return queue_notifications([(recipient, template, context or {})])
@@ -0,0 +1,35 @@
+import logging
+
+from celery import shared_task
+from post_office.connections import connections
+from post_office.models import STATUS, Email
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the first retry; doubles on every further attempt.
+RETRY_BACKOFF = 60
+MAX_RETRIES = 5
+
+
+@shared_task(bind=True, max_retries=MAX_RETRIES)
+def dispatch_emails(self, email_ids):
+    """
+    Deliver queued post_office emails over one SMTP connection.
+
+    Emails that fail are retried together with exponential backoff.
+    """
+    emails = Email.objects.filter(id__in=email_ids).exclude(status=STATUS.sent)
+    failed = []
+    try:
+        for email in emails:
+            if email.dispatch(disconnect_after_delivery=False) != STATUS.sent:
+                failed.append(email.id)
+    finally:
+        connections.close()
+
+    if failed:
+        logger.warning("Failed to deliver emails %s", failed)
+        raise self.retry(args=[failed], countdown=RETRY_BACKOFF * 2 ** self.request.retries)
+
+    return len(email_ids)
+
@@ -1,3 +1,72 @@
+from unittest import mock
+
+from celery.exceptions import Retry
+from django.core import mail
+from django.db import transaction
 from django.test import TestCase
+from post_office.models import STATUS, Email, EmailTemplate
+
+from apps.notifications.dispatch import queue_notification, queue_notifications
+from apps.notifications.tasks import RETRY_BACKOFF, dispatch_emails
 
 # Create your tests here.
+
+
+class NotificationDispatchTestCase(TestCase):
+    def setUp(self):
+        EmailTemplate.objects.create(name="otp", subject="Your code", content="{{ otp }}")
+
+    def messages(self, count):
+        return [(f"user{index}@example.com", "otp", {"otp": index}) for index in range(count)]
+
+    def test_mail_is_queued_only_on_commit(self):
+        with mock.patch.object(dispatch_emails, "delay") as delay:
+            with self.captureOnCommitCallbacks() as callbacks:
+                email_ids = queue_notification("user@example.com", "otp", {"otp": "1234"})
+            delay.assert_not_called()
+            self.assertEqual(Email.objects.get(id__in=email_ids).status, STATUS.queued)
+
+            for callback in callbacks:
+                callback()
+            delay.assert_called_once_with(email_ids)
+
+    def test_nothing_is_sent_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    queue_notification("user@example.com", "otp", {"otp": "1234"})
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertFalse(Email.objects.exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_messages_are_delivered_as_one_batch(self):
+        with mock.patch.object(dispatch_emails, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                email_ids = queue_notifications(self.messages(3))
+        delay.assert_called_once_with(email_ids)
+
+        with mock.patch("apps.notifications.tasks.connections.close") as close:
+            self.assertEqual(dispatch_emails(email_ids), 3)
+        close.assert_called_once_with()
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [f"user{index}@example.com" for index in range(3)])
+        self.assertFalse(Email.objects.exclude(status=STATUS.sent).exists())
+
+    def test_failed_deliveries_are_retried_with_backoff(self):
+        with self.captureOnCommitCallbacks():
+            email_ids = queue_notifications(self.messages(2))
+
+        for retries, countdown in ((0, RETRY_BACKOFF), (2, RETRY_BACKOFF * 4)):
+            with self.subTest(retries=retries):
+                dispatch_emails.push_request(retries=retries)
+                try:
+                    with mock.patch.object(Email, "dispatch", return_value=STATUS.failed), mock.patch.object(
+                        dispatch_emails, "retry", side_effect=Retry
+                    ) as retry:
+                        with self.assertLogs("apps.notifications.tasks", "WARNING"), self.assertRaises(Retry):
+                            dispatch_emails.run(email_ids)
+                finally:
+                    dispatch_emails.pop_request()
+                retry.assert_called_once_with(args=[email_ids], countdown=countdown)
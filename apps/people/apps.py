@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PeopleConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.people"
+
+    def ready(self):
+        from apps.people import signals  # noqa: F401
@@ -1,4 +1,5 @@
 from apps.people.models import User
+from apps.people.authentication import JWT_ALGORITHM, JWT_SECRET_KEY
 import pyotp
 import time
 from rest_framework.response import Response
@@ -25,7 +26,7 @@ class Authenticator:
             "exp": arrow.utcnow().shift(days=30).datetime,
             "iat": arrow.utcnow().datetime,
         }
-        token = jwt.encode(payload, config("SECRET_KEY"), algorithm="HS256")
+        token = jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
         return token
 
     def generate_otp(self):
@@ -0,0 +1,110 @@
+import jwt
+from decouple import config
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from rest_framework.authentication import BaseAuthentication
+
+from apps.people.models import Role
+
+User = get_user_model()
+
+# Key material is loaded once per process instead of on every request.
+JWT_SECRET_KEY = config("SECRET_KEY")
+JWT_ALGORITHM = "HS256"
+
+PRINCIPAL_CACHE_TIMEOUT = 60
+# Only what authorization reads is cached; any other field is loaded from
+# the database on first access.
+PRINCIPAL_FIELDS = ("id", "username", "is_active", "is_superuser", "department_id", "role_id")
+
+
+def principal_cache_key(user_id):
+    return f"principal:{user_id}"
+
+
+def load_principal(user_id):
+    row = User.objects.filter(id=user_id).values(*PRINCIPAL_FIELDS, role_name=F("role__name")).first()
+    if row is None:
+        return None
+    role_name = row.pop("role_name")
+    return {
+        "user": row,
+        "role": {"id": row["role_id"], "name": role_name} if row["role_id"] else None,
+    }
+
+
+def from_columns(model, columns):
+    # from_db() takes the values in the model's field order
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in columns]
+    return model.from_db(None, names, [columns[name] for name in names])
+
+
+def get_principal(user_id):
+    """
+    Return the user for ``user_id`` with its role loaded.
+
+    The authorization columns are cached for ``PRINCIPAL_CACHE_TIMEOUT``
+    seconds, so steady-state requests resolve the principal without touching
+    the database.
+    """
+    key = principal_cache_key(user_id)
+    principal = cache.get(key)
+    if principal is None:
+        principal = load_principal(user_id)
+        if principal is None:
+            return None
+        cache.set(key, principal, PRINCIPAL_CACHE_TIMEOUT)
+
+    user = from_columns(User, principal["user"])
+    if principal["role"] is not None:
+        user.role = from_columns(Role, principal["role"])
+    return user
+
+
+def invalidate_principals(user_ids):
+    """
+    Drop the cached principals of ``user_ids`` once the current transaction commits.
+
+    Dropping them earlier would let a concurrent request cache the old row
+    again before the change is visible.
+    """
+    keys = [principal_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class JWTAuthentication(BaseAuthentication):
+    """
+    Authenticates the ``Authorization`` header token issued by ``Authenticator``.
+
+    A bad token does not fail the request here, so endpoints that allow
+    anonymous access keep working. The reason is kept on ``request.auth_error``
+    for ``TokenRequiredPermission`` to report.
+    """
+
+    def authenticate(self, request):
+        access_token = request.headers.get("Authorization")
+        if not access_token:
+            return None
+
+        if access_token.startswith("Bearer "):
+            access_token = access_token[len("Bearer "):]
+
+        try:
+            decoded_token = jwt.decode(
+                access_token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM]
+            )
+        except jwt.ExpiredSignatureError:
+            request.auth_error = "Access token has already expired."
+            return None
+        except jwt.InvalidTokenError:
+            request.auth_error = "Invalid access token."
+            return None
+
+        user = get_principal(decoded_token.get("user_id"))
+        if user is None:
+            request.auth_error = "User not found."
+            return None
+
+        return user, decoded_token
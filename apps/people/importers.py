@@ -0,0 +1,144 @@
+"""
+Bulk onboarding of users from an HR CSV file.
+
+Uniqueness of email, phone, employee number and the derived username is
+checked with one set-based query per chunk. Rows are inserted without a
+password with ``bulk_create`` (``User.save`` is bypassed); each inserted
+chunk is handed to Celery tasks that hash the temporary passwords in
+parallel batches and queue the credential emails, so no hashing happens in
+the request.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from apps.core.response_cache import invalidate_models
+from apps.core.uploads import read_csv_rows
+from apps.people.models import Department, Role, User
+from apps.people.serializers import UserImportRowSerializer
+from apps.people.tasks import schedule_temporary_passwords
+
+IMPORT_CHUNK_SIZE = 500
+
+
+class UserImporter:
+    unique_fields = ("email", "phone", "employee_no", "username")
+
+    def __init__(self, upload, chunk_size=IMPORT_CHUNK_SIZE):
+        self.upload = upload
+        self.chunk_size = chunk_size
+        self.created = 0
+        self.errors = []
+        self.seen = {field: set() for field in self.unique_fields}
+
+    def add_error(self, line, errors):
+        self.errors.append({"row": line, "errors": errors})
+
+    def run(self):
+        rows = list(read_csv_rows(self.upload))
+
+        self.departments = {
+            department.name: department
+            for department in Department.objects.filter(
+                name__in={row["department"] for _, row in rows if row.get("department")}
+            )
+        }
+        self.roles = {
+            role.name: role
+            for role in Role.objects.filter(
+                name__in={row["role"] for _, row in rows if row.get("role")}
+            )
+        }
+
+        candidates = []
+        for start in range(0, len(rows), self.chunk_size):
+            candidates.extend(self.check_chunk(rows[start:start + self.chunk_size]))
+
+        for start in range(0, len(candidates), self.chunk_size):
+            self.insert_chunk(candidates[start:start + self.chunk_size])
+
+        if self.created:
+            invalidate_models([User])
+
+        return {
+            "created": self.created,
+            "failed": len(self.errors),
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+        }
+
+    def build_user(self, line, row):
+        serializer = UserImportRowSerializer(data=row)
+        if not serializer.is_valid():
+            self.add_error(line, serializer.errors)
+            return None
+        data = serializer.validated_data
+
+        errors = {}
+        department = self.departments.get(data["department"])
+        if department is None:
+            errors["department"] = ["Department does not exist"]
+        role = self.roles.get(data["role"])
+        if role is None:
+            errors["role"] = ["Role does not exist"]
+        if errors:
+            self.add_error(line, errors)
+            return None
+
+        return User(
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            email=data["email"],
+            username=data["email"].split("@")[0].strip(),
+            phone=data["phone"],
+            employee_no=data["employee_no"],
+            title=data.get("title") or None,
+            location=data.get("location") or None,
+            department=department,
+            role=role,
+        )
+
+    def check_chunk(self, chunk):
+        candidates = []
+        for line, row in chunk:
+            user = self.build_user(line, row)
+            if user is not None:
+                candidates.append((line, user))
+        if not candidates:
+            return []
+
+        lookup = Q()
+        for field in self.unique_fields:
+            lookup |= Q(**{f"{field}__in": {getattr(user, field) for _, user in candidates}})
+        taken = {field: set() for field in self.unique_fields}
+        for values in User.objects.filter(lookup).values_list(*self.unique_fields):
+            for field, value in zip(self.unique_fields, values):
+                taken[field].add(value)
+
+        accepted = []
+        for line, user in candidates:
+            errors = {}
+            for field in self.unique_fields:
+                value = getattr(user, field)
+                if value in taken[field] or value in self.seen[field]:
+                    errors[field] = [f"User already exists with the given {field.replace('_', ' ')}"]
+                self.seen[field].add(value)
+            if errors:
+                self.add_error(line, errors)
+                continue
+            accepted.append((line, user))
+        return accepted
+
+    def insert_chunk(self, chunk):
+        try:
+            with transaction.atomic():
+                users = User.objects.bulk_create([user for _, user in chunk])
+        except IntegrityError as error:
+            # a concurrent writer took one of the values after the check
+            for line, _ in chunk:
+                self.add_error(line, {"non_field_errors": [str(error)]})
+            return False
+
+        user_ids = [user.id for user in users]
+        transaction.on_commit(lambda: schedule_temporary_passwords(user_ids))
+        self.created += len(chunk)
+        return True
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:08
+
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+
+    # the indexes are built concurrently, which cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("people", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="department",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="department_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="role",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="role_created_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="user",
+            index=models.Index(
+                fields=["-created_at", "-id"],
+                name="user_created_idx",
+            ),
+        ),
+    ]
@@ -19,6 +19,7 @@ class Role(models.Model):
         verbose_name = "Role"
         verbose_name_plural = "Roles"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="role_created_idx")]
 
     def __str__(self) -> str:
         return self.name
@@ -43,6 +44,7 @@ class Department(models.Model):
         verbose_name = "Department"
         verbose_name_plural = "Departments"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="department_created_idx")]
 
     def __str__(self) -> str:
         return self.name
@@ -76,6 +78,7 @@ class User(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["-created_at", "-id"], name="user_created_idx")]
 
     def __str__(self) -> str:
         return self.username
@@ -1,9 +1,30 @@
+from django.conf import settings
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
 from apps.assets.models import AssetAssignment, AssetRequest, MaintenanceRequest,   Asset
+from apps.core.mixins import SparseFieldsetSerializerMixin
 from apps.people.models import Department, Role, User
 from rest_framework import serializers
 
 
-class RoleSerializer(serializers.ModelSerializer):
+def related_count(model, field="user"):
+    """
+    Correlated ``COUNT(*)`` of ``model`` rows pointing at the outer row.
+
+    Subqueries avoid the row fan-out of annotating several reverse joins
+    with ``Count`` on the same queryset.
+    """
+    counts = (
+        model.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class RoleSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Role
@@ -17,15 +38,28 @@ class DepartmentCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class DepartmentListSerializer(serializers.ModelSerializer):
-    total_users = serializers.SerializerMethodField()
+class DepartmentListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    total_users = serializers.IntegerField(read_only=True)
+    assigned_assets = serializers.IntegerField(read_only=True)
+    assigned_assets_value = serializers.FloatField(read_only=True)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        # department -> user -> asset is a single chain of joins, so each
+        # asset is counted and summed once per department.
+        annotations = {
+            "total_users": Count("user", distinct=True),
+            "assigned_assets": Count("user__asset", distinct=True),
+            "assigned_assets_value": Coalesce(
+                Sum("user__asset__purchase_price"), 0.0, output_field=FloatField()
+            ),
+        }
+        if fields is not None:
+            annotations = {
+                name: value for name, value in annotations.items() if name in fields
+            }
+        return super().setup_eager_loading(queryset, fields).annotate(**annotations)
 
-    def get_total_users(self, obj):
-        users = User.objects.filter(department=obj)
-        if users:
-            return users.count()
-        return 0
-    
     class Meta:
         model = Department
         fields = "__all__"
@@ -38,7 +72,26 @@ class UserCreateUpdateSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserImportRowSerializer(serializers.Serializer):
+    """
+    Validates one row of an HR onboarding file.
+
+    Department and role are given by name; the importer resolves them and
+    checks uniqueness for the whole file.
+    """
+
+    first_name = serializers.CharField(max_length=150)
+    last_name = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    phone = serializers.CharField(max_length=255)
+    employee_no = serializers.CharField(max_length=300)
+    department = serializers.CharField(max_length=255)
+    role = serializers.CharField(max_length=255)
+    title = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    location = serializers.CharField(max_length=300, required=False, allow_blank=True)
+
+
+class UserListSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     department = serializers.SerializerMethodField()
     role = serializers.SerializerMethodField()
 
@@ -46,71 +99,86 @@ class UserListSerializer(serializers.ModelSerializer):
     assigned_assets = serializers.SerializerMethodField()
     asset_requests = serializers.SerializerMethodField()
     maintenance_requests = serializers.SerializerMethodField()
-    # current_assets = serializers.SerializerMethodField()
 
-    # def get_current_assets(self, obj):
-    #     assets = Asset.objects.filter(user=obj)
-    #     if assets:
-    #         return assets.count()
-    #     return 0
+    related_fields = {
+        "department": ("id", "uid", "name"),
+        "role": ("id", "name"),
+    }
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None):
+        # Totals are counted in SQL; only the first USER_NESTED_ASSETS_LIMIT
+        # rows of each nested list are fetched, newest first.
+        limit = settings.USER_NESTED_ASSETS_LIMIT
+        asset_columns = ("asset__uid", "asset__name", "asset__model")
+
+        def selected(name):
+            return fields is None or name in fields
+
+        queryset = super().setup_eager_loading(queryset, fields)
+        annotations, prefetches = {}, []
+
+        if selected("assigned_assets"):
+            annotations["assigned_assets_total"] = related_count(AssetAssignment)
+            prefetches.append(
+                Prefetch(
+                    "assetassignment_set",
+                    queryset=AssetAssignment.objects.select_related("asset").only(
+                        "user", "asset", "created_at", *asset_columns, "asset__serial_no"
+                    )[:limit],
+                    to_attr="prefetched_assignments",
+                )
+            )
+        if selected("asset_requests"):
+            annotations["asset_requests_total"] = related_count(AssetRequest)
+            prefetches.append(
+                Prefetch(
+                    "assetrequest_set",
+                    queryset=AssetRequest.objects.select_related("asset").only(
+                        "user", "asset", "created_at", "request_date", *asset_columns
+                    )[:limit],
+                    to_attr="prefetched_asset_requests",
+                )
+            )
+        if selected("maintenance_requests"):
+            annotations["maintenance_requests_total"] = related_count(MaintenanceRequest)
+        prefetches.extend(name for name in ("groups", "user_permissions") if selected(name))
+
+        return queryset.annotate(**annotations).prefetch_related(*prefetches)
 
     def get_assigned_assets(self, obj):
-        # Get all asset assignments for the user
-        asi_assets = AssetAssignment.objects.filter(user=obj)
-        
-        if asi_assets.exists():
-            # Initialize a list to store asset details
-            assets_details = []
-            
-            # Loop through each asset assignment and extract the asset details
-            for assignment in asi_assets:
-                asset = assignment.asset
-                assets_details.append({
-                    "asset_uid":asset.uid,
-                    "asset_name": asset.name,
-                    "model": asset.model,
-                    "serial_no": asset.serial_no
-                })
-            
-            # Return the total count and the list of asset details
-            return {
-                "total": asi_assets.count(),
-                "assets": assets_details
+        if not obj.assigned_assets_total:
+            # Return an empty dictionary if no assets are assigned
+            return {}
+
+        assets_details = [
+            {
+                "asset_uid": assignment.asset.uid,
+                "asset_name": assignment.asset.name,
+                "model": assignment.asset.model,
+                "serial_no": assignment.asset.serial_no,
             }
-    
-    # Return an empty dictionary if no assets are assigned
-        return {}
+            for assignment in obj.prefetched_assignments
+        ]
+        return {"total": obj.assigned_assets_total, "assets": assets_details}
 
-
-    
     def get_asset_requests(self, obj):
-        asi_requests = AssetRequest.objects.filter(user=obj)
-        
-        if asi_requests.exists():
-            # Initialize a list to store asset details
-            assets_details = []
-            
-            # Loop through each asset assignment and extract the asset details
-            for assignment in asi_requests:
-                asset = assignment.asset
-                assets_details.append({
-                    "asset_uid":asset.uid,
-                    "asset_name": asset.name,
-                    "model": asset.model,
-                    "request_date": assignment.request_date
-                })
-            
-            # Return the total count and the list of asset details
-            return {
-                "total": asi_requests.count(),
-                "assets": assets_details
+        if not obj.asset_requests_total:
+            return None
+
+        assets_details = [
+            {
+                "asset_uid": asset_request.asset.uid,
+                "asset_name": asset_request.asset.name,
+                "model": asset_request.asset.model,
+                "request_date": asset_request.request_date,
             }
+            for asset_request in obj.prefetched_asset_requests
+        ]
+        return {"total": obj.asset_requests_total, "assets": assets_details}
+
     def get_maintenance_requests(self, obj):
-        mtnc_requests = MaintenanceRequest.objects.filter(user=obj)
-        if mtnc_requests.exists():
-            return mtnc_requests.count()
-        
-        return 0
+        return obj.maintenance_requests_total
 
     def get_department(self, obj):
         if obj.department:
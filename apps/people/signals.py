@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+
+from apps.core.response_cache import invalidate_models
+from apps.people.authentication import invalidate_principals
+from apps.people.models import Department, Role, User
+
+
+def invalidate_user_principal(sender, instance, **kwargs):
+    invalidate_principals([instance.id])
+
+
+def invalidate_member_principals(sender, instance, **kwargs):
+    # cached principals embed their role's name
+    user_ids = User.objects.filter(role=instance).values_list("id", flat=True)
+    invalidate_principals(list(user_ids))
+
+
+def bump_people_tag(sender, **kwargs):
+    invalidate_models([sender])
+
+
+post_save.connect(invalidate_user_principal, sender=User)
+post_delete.connect(invalidate_user_principal, sender=User)
+post_save.connect(invalidate_member_principals, sender=Role)
+for model in (User, Role, Department):
+    post_save.connect(bump_people_tag, sender=model)
+    post_delete.connect(bump_people_tag, sender=model)
@@ -0,0 +1,56 @@
+import uuid
+
+import arrow
+from celery import group, shared_task
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.core.response_cache import invalidate_models
+from apps.notifications.dispatch import queue_notifications
+from apps.people.models import User
+
+# Users hashed by one task; small batches spread an import over every
+# process of the worker pool, which Celery sizes to the available cores.
+PASSWORD_BATCH_SIZE = 20
+
+
+def schedule_temporary_passwords(user_ids):
+    """
+    Issue temporary passwords for ``user_ids`` in parallel batches.
+    """
+    batches = [
+        user_ids[start:start + PASSWORD_BATCH_SIZE]
+        for start in range(0, len(user_ids), PASSWORD_BATCH_SIZE)
+    ]
+    return group([issue_temporary_passwords.s(batch) for batch in batches]).delay()
+
+
+@shared_task
+def issue_temporary_passwords(user_ids):
+    """
+    Hash temporary passwords for imported users and email their credentials.
+
+    Hashing is deliberately slow, so it runs in a worker instead of the
+    import request. The expiry starts once the batch is hashed, when its
+    emails are queued. Only users still without a password are picked up,
+    so a retried task never issues a second set.
+    """
+    users = list(User.objects.filter(id__in=user_ids, password__isnull=True))
+    if not users:
+        return 0
+
+    messages = []
+    for user in users:
+        password = uuid.uuid4().hex[:8]
+        user.password = make_password(password)
+        messages.append((user.email, "login-credentials", {"email": user.email, "password": password}))
+
+    expiry = arrow.now().shift(minutes=+3).datetime
+    for user in users:
+        user.password_expiry = expiry
+
+    with transaction.atomic():
+        User.objects.bulk_update(users, ["password", "password_expiry"])
+        queue_notifications(messages)
+        invalidate_models([User])
+    return len(users)
@@ -1,3 +1,182 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+from post_office.models import Email, EmailTemplate
+
+from apps.assets.models import AssetAssignment, AssetRequest, MaintenanceRequest
+from apps.assets.tests import AssetAPITestCase
+from apps.people.authentication import get_principal, principal_cache_key
+from apps.people.models import Department, User
+from apps.people import tasks
+from apps.people.tasks import issue_temporary_passwords
 
 # Create your tests here.
+
+
+class UserListTestCase(AssetAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user("other")
+        for index in range(3):
+            asset = self.create_asset(index)
+            AssetAssignment.objects.create(asset=asset, user=self.user)
+            AssetAssignment.objects.create(asset=asset, user=self.other)
+            AssetRequest.objects.create(asset=asset, user=self.user, request_date=datetime.date.today())
+        MaintenanceRequest.objects.create(asset=asset, user=self.user, description="Broken screen")
+
+    def get_users(self):
+        response = self.client.get("/api/users/")
+        self.assertEqual(response.status_code, 200)
+        return {user["email"]: user for user in response.data["info"]}
+
+    def test_totals_are_annotated(self):
+        users = self.get_users()
+
+        admin = users[self.user.email]
+        self.assertEqual(admin["assigned_assets"]["total"], 3)
+        self.assertEqual(admin["asset_requests"]["total"], 3)
+        self.assertEqual(admin["maintenance_requests"], 1)
+
+        other = users[self.other.email]
+        self.assertEqual(other["assigned_assets"]["total"], 3)
+        self.assertIsNone(other["asset_requests"])
+        self.assertEqual(other["maintenance_requests"], 0)
+
+    @override_settings(USER_NESTED_ASSETS_LIMIT=2)
+    def test_nested_rows_are_limited_per_user(self):
+        users = self.get_users()
+
+        for email in (self.user.email, self.other.email):
+            with self.subTest(email=email):
+                assigned = users[email]["assigned_assets"]
+                self.assertEqual(assigned["total"], 3)
+                self.assertEqual(len(assigned["assets"]), 2)
+        self.assertEqual(len(users[self.user.email]["asset_requests"]["assets"]), 2)
+
+
+class DepartmentListTestCase(AssetAPITestCase):
+    def test_head_counts_and_asset_totals(self):
+        other = self.create_user("other")
+        self.create_asset(0, purchase_price=1000.0, current_assignee=self.user)
+        self.create_asset(1, purchase_price=250.0, current_assignee=self.user)
+        self.create_asset(2, purchase_price=500.0, current_assignee=other)
+        self.create_asset(3, purchase_price=4000.0)
+        empty = Department.objects.create(name="Finance", manager="Manager")
+
+        response = self.client.get("/api/departments/")
+        self.assertEqual(response.status_code, 200)
+        departments = {department["id"]: department for department in response.data["info"]}
+
+        it = departments[self.department.id]
+        self.assertEqual(it["total_users"], 2)
+        self.assertEqual(it["assigned_assets"], 3)
+        self.assertEqual(it["assigned_assets_value"], 1750.0)
+
+        finance = departments[empty.id]
+        self.assertEqual(finance["total_users"], 0)
+        self.assertEqual(finance["assigned_assets"], 0)
+        self.assertEqual(finance["assigned_assets_value"], 0.0)
+
+
+class PrincipalCacheTestCase(AssetAPITestCase):
+    def test_only_authorization_fields_are_cached(self):
+        user = get_principal(self.user.id)
+        self.assertEqual(user.role.name, "admin")
+        self.assertEqual(user.department_id, self.department.id)
+
+        cached = cache.get(principal_cache_key(self.user.id))
+        self.assertNotIn(self.user.password, repr(cached))
+        self.assertNotIn(self.user.email, repr(cached))
+        # anything else is read from the database when asked for
+        with self.assertNumQueries(1):
+            self.assertEqual(get_principal(self.user.id).email, self.user.email)
+
+    def test_principal_is_dropped_when_the_change_commits(self):
+        get_principal(self.user.id)
+        key = principal_cache_key(self.user.id)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.user.save()
+        self.assertIsNotNone(cache.get(key))
+
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(key))
+
+
+class UserImportTestCase(AssetAPITestCase):
+    header = "first_name,last_name,email,phone,employee_no,department,role\n"
+
+    def setUp(self):
+        super().setUp()
+        EmailTemplate.objects.create(name="login-credentials", content="{{ email }} {{ password }}")
+
+    def upload(self, count):
+        rows = "".join(
+            f"User,{index},user{index}@example.com,02400000{index:02d},EMP-{100 + index},IT,admin\n"
+            for index in range(count)
+        )
+        upload = SimpleUploadedFile("users.csv", (self.header + rows).encode("utf-8"), content_type="text/csv")
+        return self.client.post("/api/users/bulk-import/", {"file": upload}, format="multipart")
+
+    def test_temporary_passwords_are_issued_outside_the_request(self):
+        upload = SimpleUploadedFile(
+            "users.csv",
+            (
+                self.header
+                + "Ama,Mensah,ama@example.com,0240000001,EMP-100,IT,admin\n"
+                + "Kofi,Boateng,kofi@example.com,0240000002,EMP-101,IT,admin\n"
+            ).encode("utf-8"),
+            content_type="text/csv",
+        )
+        with self.captureOnCommitCallbacks():
+            response = self.client.post("/api/users/bulk-import/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["info"]["created"], 2)
+
+        imported = User.objects.filter(email__in=["ama@example.com", "kofi@example.com"])
+        self.assertEqual([user.password for user in imported], [None, None])
+        self.assertFalse(Email.objects.exists())
+
+        user_ids = [user.id for user in imported]
+        self.assertEqual(issue_temporary_passwords(user_ids), 2)
+        for user in User.objects.filter(id__in=user_ids):
+            self.assertTrue(user.has_usable_password())
+            self.assertIsNotNone(user.password_expiry)
+        self.assertEqual(Email.objects.count(), 2)
+
+        # a retried task leaves the issued passwords alone
+        self.assertEqual(issue_temporary_passwords(user_ids), 0)
+        self.assertEqual(Email.objects.count(), 2)
+
+    @mock.patch.object(tasks, "PASSWORD_BATCH_SIZE", 2)
+    def test_passwords_are_hashed_in_parallel_batches(self):
+        with mock.patch.object(tasks, "group", wraps=tasks.group) as group:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload(5)
+        self.assertEqual(response.data["info"]["created"], 5)
+
+        batches = [signature.args[0] for signature in group.call_args.args[0]]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertFalse(User.objects.filter(email__startswith="user", password__isnull=True).exists())
+
+    def test_expiry_starts_once_the_batch_is_hashed(self):
+        with self.captureOnCommitCallbacks():
+            self.upload(2)
+        user_ids = list(User.objects.filter(password__isnull=True).values_list("id", flat=True))
+
+        hashed_at = []
+
+        def make_password(password):
+            hashed_at.append(timezone.now())
+            return f"hashed:{password}"
+
+        with mock.patch.object(tasks, "make_password", side_effect=make_password):
+            issue_temporary_passwords(user_ids)
+
+        for user in User.objects.filter(id__in=user_ids):
+            self.assertGreaterEqual(user.password_expiry, max(hashed_at) + datetime.timedelta(minutes=3))
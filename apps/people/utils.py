@@ -2,19 +2,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 import requests
-from decouple import config
-from post_office import mail
+
+from apps.notifications.dispatch import queue_notification
 
 
 def send_notification(recipient, context=None):
-        template = context["template"]
-        mail.send(
-            recipient,
-            config("DEFAULT_FROM_EMAIL"),
-            template=template,
-            context=context["context"],
-            priority="now",
-        )
+        # queued for a Celery worker; nothing is sent inside the request
+        return queue_notification(recipient, context["template"], context["context"])
 
 
 def send_login_credentials(email,password):
@@ -8,7 +8,14 @@ from apps.people.serializers import (
     DepartmentListSerializer,
 )
 from apps.people.models import User, Role, Department
+from apps.assets.models import Asset, AssetAssignment, AssetRequest, MaintenanceRequest
 from apps.people.permissions import AdminCheckPermission, TokenRequiredPermission
+from apps.core.mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    EagerLoadingMixin,
+    PaginatedListMixin,
+)
 from rest_framework import permissions, status, filters, viewsets
 from rest_framework.response import Response
 from django.contrib.auth.hashers import make_password, check_password
@@ -16,32 +23,19 @@ from django.contrib.auth import login, logout
 from rest_framework.decorators import api_view, permission_classes, action
 from apps.people.utils import send_notification
 from apps.people.auth import Authenticator
+from apps.people.importers import UserImporter
 from apps.people.utils import send_login_credentials
 # Create your views here.
 
 
 auth = Authenticator()
 
-class RoleViewset(viewsets.ModelViewSet):
+class RoleViewset(EagerLoadingMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = Role.objects.all()
     serializer_class = RoleSerializer
     permission_classes = [AdminCheckPermission]
     lookup_field = "uid"
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
     def create(self, request, *args, **kwargs):
         data = request.data
 
@@ -71,10 +65,11 @@ class RoleViewset(viewsets.ModelViewSet):
         )
 
 
-class DepartmentViewset(viewsets.ModelViewSet):
+class DepartmentViewset(EagerLoadingMixin, ConditionalGetMixin, CachedListMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = Department.objects.all()
     permission_classes = [AdminCheckPermission]
     lookup_field = "uid"
+    etag_dependencies = (User, Asset)
     filter_backends = [filters.SearchFilter]
 
     def get_serializer_class(self):
@@ -82,20 +77,6 @@ class DepartmentViewset(viewsets.ModelViewSet):
             return DepartmentCreateUpdateSerializer
         return DepartmentListSerializer
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
     def create(self, request, *args, **kwargs):
         data = request.data
         required_fields = ["name", "manager"]
@@ -126,32 +107,26 @@ class DepartmentViewset(viewsets.ModelViewSet):
         )
 
 
-class UserViewset(viewsets.ModelViewSet):
+class UserViewset(EagerLoadingMixin, ConditionalGetMixin, PaginatedListMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserListSerializer
     permission_classes = [permissions.AllowAny]
     filter_backends = [filters.SearchFilter]
     lookup_field = "uid"
+    etag_dependencies = (
+        Department,
+        Role,
+        Asset,
+        AssetAssignment,
+        AssetRequest,
+        MaintenanceRequest,
+    )
 
     def get_serializer_class(self):
         if self.action in ["create", "update", "partial_update"]:
             return UserCreateUpdateSerializer
         return UserListSerializer
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
-    def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return Response(
-            {"success": True, "info": serializer.data}, status=status.HTTP_200_OK
-        )
-
     def create(self, request, *args, **kwargs):
         data = request.data
         required_fields = [
@@ -194,6 +169,29 @@ class UserViewset(viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED,
         )
 
+    @action(
+        detail=False, methods=["post"], permission_classes=[TokenRequiredPermission, AdminCheckPermission], url_path='bulk-import'
+    )
+    def bulk_import(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response(
+                {"success": False, "info": "file is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not upload.name.lower().endswith(".csv"):
+            return Response(
+                {"success": False, "info": "Only CSV files are supported"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = UserImporter(upload).run()
+        return Response(
+            {"success": not report["errors"], "info": report},
+            status=status.HTTP_201_CREATED if report["created"] else status.HTTP_400_BAD_REQUEST,
+        )
+
     @action(
         detail=False, methods=["post"], permission_classes=[permissions.AllowAny], url_path='update-password'
     )
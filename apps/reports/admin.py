@@ -1,3 +1,11 @@
 from django.contrib import admin
 
+from apps.reports.models import InventoryCount
+
 # Register your models here.
+
+
+@admin.register(InventoryCount)
+class InventoryCountAdmin(admin.ModelAdmin):
+    list_display = ("dimension", "key", "count", "value", "updated_at")
+    list_filter = ("dimension",)
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class ReportsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "reports"
+    name = "apps.reports"
+
+    def ready(self):
+        from apps.reports import signals  # noqa: F401
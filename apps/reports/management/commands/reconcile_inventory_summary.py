@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.reports.summary import reconcile
+
+
+class Command(BaseCommand):
+    help = "Rebuild the inventory summary counters from the asset, request and maintenance tables."
+
+    def handle(self, *args, **options):
+        reconcile()
+        self.stdout.write("Inventory summary reconciled")
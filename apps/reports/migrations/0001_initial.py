@@ -0,0 +1,57 @@
+# Generated by Django 5.0.8 on 2026-10-18 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="CountedAsset",
+            fields=[
+                ("asset_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("status_id", models.BigIntegerField()),
+                ("category_id", models.BigIntegerField()),
+                ("department_id", models.BigIntegerField(null=True)),
+                ("purchase_price", models.FloatField()),
+            ],
+            options={
+                "verbose_name": "Counted Asset",
+                "verbose_name_plural": "Counted Assets",
+            },
+        ),
+        migrations.CreateModel(
+            name="InventoryCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=32)),
+                ("key", models.CharField(max_length=64)),
+                ("count", models.BigIntegerField(default=0)),
+                ("value", models.FloatField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Inventory Count",
+                "verbose_name_plural": "Inventory Counts",
+                "ordering": ["dimension", "key"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="inventorycount",
+            constraint=models.UniqueConstraint(
+                fields=("dimension", "key"), name="inventorycount_dimension_key"
+            ),
+        ),
+    ]
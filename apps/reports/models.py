@@ -1,3 +1,44 @@
 from django.db import models
 
 # Create your models here.
+
+
+class InventoryCount(models.Model):
+    """
+    One counter of the inventory summary, such as ``("status", "<id>")`` or
+    ``("assets", "deployed")``. ``value`` sums ``purchase_price`` for the
+    asset counters. Maintained by apps.reports.summary.
+    """
+    dimension = models.CharField(max_length=32)
+    key = models.CharField(max_length=64)
+    count = models.BigIntegerField(default=0)
+    value = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Inventory Count"
+        verbose_name_plural = "Inventory Counts"
+        ordering = ["dimension", "key"]
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "key"], name="inventorycount_dimension_key"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}:{self.key}"
+
+
+class CountedAsset(models.Model):
+    """
+    An asset as it was last counted, so any later change to it can be
+    applied to the counters as a delta. Not a foreign key: the row has to
+    outlive the asset until its deletion has been counted.
+    """
+    asset_id = models.BigIntegerField(primary_key=True)
+    status_id = models.BigIntegerField()
+    category_id = models.BigIntegerField()
+    department_id = models.BigIntegerField(null=True)
+    purchase_price = models.FloatField()
+
+    class Meta:
+        verbose_name = "Counted Asset"
+        verbose_name_plural = "Counted Assets"
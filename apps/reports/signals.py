@@ -0,0 +1,74 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from apps.assets.models import Asset, AssetRequest, MaintenanceRequest
+from apps.assets.transitions import asset_requests_decided, asset_transitioned, assets_created
+from apps.people.models import User
+from apps.reports import summary
+
+
+def count_saved_asset(sender, instance, **kwargs):
+    summary.assets_changed([instance.pk])
+
+
+def count_transitioned_asset(sender, asset_id, **kwargs):
+    summary.assets_changed([asset_id])
+
+
+def count_created_assets(sender, asset_ids, **kwargs):
+    summary.assets_changed(asset_ids)
+
+
+def count_reassigned_department(sender, instance, created=False, update_fields=None, **kwargs):
+    # assets are counted under their assignee's department
+    if created or (update_fields is not None and "department" not in update_fields):
+        return
+    summary.assets_changed(Asset.objects.filter(current_assignee=instance).values_list("id", flat=True))
+
+
+post_save.connect(count_saved_asset, sender=Asset)
+post_delete.connect(count_saved_asset, sender=Asset)
+asset_transitioned.connect(count_transitioned_asset)
+assets_created.connect(count_created_assets)
+post_save.connect(count_reassigned_department, sender=User)
+
+
+STATUS_COUNTERS = {
+    AssetRequest: (("requests", "pending"), ("pending",)),
+    MaintenanceRequest: (("maintenance", "open"), summary.OPEN_MAINTENANCE),
+}
+
+
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    if instance._state.adding:
+        instance._previous_status = None
+    elif update_fields is None or "status" in update_fields:
+        instance._previous_status = (
+            sender.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+        )
+
+
+def count_status_change(sender, instance, created=False, **kwargs):
+    if "_previous_status" not in instance.__dict__:
+        return
+    previous = instance.__dict__.pop("_previous_status")
+    counter, counted = STATUS_COUNTERS[sender]
+    change = (instance.status in counted) - (previous in counted)
+    summary.add_to_counter(*counter, change)
+
+
+def count_deleted_status(sender, instance, **kwargs):
+    counter, counted = STATUS_COUNTERS[sender]
+    if instance.status in counted:
+        summary.add_to_counter(*counter, -1)
+
+
+def count_decided_requests(sender, request_ids, **kwargs):
+    # bulk decisions only ever move pending requests
+    summary.add_to_counter("requests", "pending", -len(request_ids))
+
+
+for model in STATUS_COUNTERS:
+    pre_save.connect(remember_previous_status, sender=model)
+    post_save.connect(count_status_change, sender=model)
+    post_delete.connect(count_deleted_status, sender=model)
+asset_requests_decided.connect(count_decided_requests)
@@ -0,0 +1,195 @@
+"""
+Incrementally maintained inventory summary.
+
+Dashboards read counters from InventoryCount instead of counting the
+inventory on every load. Writers mark what changed: assets by id, and
+pending-request or open-maintenance counts by delta. At commit the marks
+of the whole transaction are applied in one pass. Each changed asset is
+compared with its CountedAsset row, the difference is added to the
+counters, and the row is updated. Any code path that changes an asset
+only needs to report its id. ``reconcile`` rebuilds everything from
+scratch and runs nightly to correct drift.
+"""
+
+from collections import defaultdict, namedtuple
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.assets.models import Asset, AssetRequest, MaintenanceRequest
+from apps.assets.registry import statuses
+from apps.core.buffers import transaction_buffer
+from apps.reports.models import CountedAsset, InventoryCount
+
+OPEN_MAINTENANCE = ("pending", "in-progress")
+NO_DEPARTMENT = "none"
+RECONCILE_CHUNK_SIZE = 2000
+
+AssetState = namedtuple("AssetState", "status_id category_id department_id purchase_price")
+
+
+def asset_counters(state, deployed_id):
+    """
+    The counters one asset in ``state`` adds to.
+    """
+    department = str(state.department_id) if state.department_id else NO_DEPARTMENT
+    counters = [
+        ("assets", "total"),
+        ("status", str(state.status_id)),
+        ("category", str(state.category_id)),
+        ("department", department),
+    ]
+    if state.status_id == deployed_id:
+        counters.append(("assets", "deployed"))
+    return counters
+
+
+def deployed_status_id():
+    deployed = statuses.by_name("deployed")
+    return deployed.id if deployed else None
+
+
+class PendingChanges:
+    def __init__(self, using):
+        self.using = using
+        self.asset_ids = set()
+        self.deltas = defaultdict(lambda: [0, 0.0])
+
+    def merge(self, other):
+        self.asset_ids |= other.asset_ids
+        for key, (count, value) in other.deltas.items():
+            self.deltas[key][0] += count
+            self.deltas[key][1] += value
+
+    def flush(self):
+        with transaction.atomic(using=self.using):
+            if self.asset_ids:
+                self.count_assets()
+            apply_deltas(self.deltas, using=self.using)
+
+    def count_assets(self):
+        asset_ids = sorted(self.asset_ids)
+        current = {
+            row["id"]: AssetState(row["status_id"], row["category_id"], row["department_id"], row["purchase_price"])
+            for row in Asset.objects.using(self.using)
+            .filter(id__in=asset_ids)
+            .values("id", "status_id", "category_id", "purchase_price", department_id=F("current_assignee__department_id"))
+        }
+        counted = {
+            row.asset_id: AssetState(row.status_id, row.category_id, row.department_id, row.purchase_price)
+            for row in CountedAsset.objects.using(self.using).select_for_update().filter(asset_id__in=asset_ids)
+        }
+
+        deployed_id = deployed_status_id()
+        for asset_id in asset_ids:
+            old, new = counted.get(asset_id), current.get(asset_id)
+            if old == new:
+                continue
+            if old is not None:
+                for counter in asset_counters(old, deployed_id):
+                    self.deltas[counter][0] -= 1
+                    self.deltas[counter][1] -= old.purchase_price
+            if new is not None:
+                for counter in asset_counters(new, deployed_id):
+                    self.deltas[counter][0] += 1
+                    self.deltas[counter][1] += new.purchase_price
+
+        CountedAsset.objects.using(self.using).bulk_create(
+            [CountedAsset(asset_id=asset_id, **state._asdict()) for asset_id, state in current.items()],
+            update_conflicts=True,
+            unique_fields=["asset_id"],
+            update_fields=list(AssetState._fields),
+        )
+        removed = [asset_id for asset_id in asset_ids if asset_id not in current]
+        if removed:
+            CountedAsset.objects.using(self.using).filter(asset_id__in=removed).delete()
+
+
+def apply_deltas(deltas, using=DEFAULT_DB_ALIAS):
+    now = timezone.now()
+    counters = InventoryCount.objects.using(using)
+    for (dimension, key), (count, value) in sorted(deltas.items()):
+        if not count and not value:
+            continue
+        changes = {"count": F("count") + count, "value": F("value") + value, "updated_at": now}
+        if counters.filter(dimension=dimension, key=key).update(**changes):
+            continue
+        try:
+            with transaction.atomic(using=using):
+                counters.create(dimension=dimension, key=key, count=count, value=value)
+        except IntegrityError:
+            # created concurrently since the update above
+            counters.filter(dimension=dimension, key=key).update(**changes)
+
+
+def get_pending(using=DEFAULT_DB_ALIAS):
+    return transaction_buffer("inventory_changes", PendingChanges, using=using)
+
+
+def assets_changed(asset_ids, using=DEFAULT_DB_ALIAS):
+    if not connections[using].in_atomic_block:
+        with transaction.atomic(using=using):
+            get_pending(using).asset_ids.update(asset_ids)
+        return
+    get_pending(using).asset_ids.update(asset_ids)
+
+
+def add_to_counter(dimension, key, count, using=DEFAULT_DB_ALIAS):
+    if not count:
+        return
+    if not connections[using].in_atomic_block:
+        apply_deltas({(dimension, key): (count, 0.0)}, using=using)
+        return
+    get_pending(using).deltas[(dimension, key)][0] += count
+
+
+def reconcile(using=DEFAULT_DB_ALIAS):
+    """
+    Rebuild every counter and CountedAsset row from the source tables.
+
+    On PostgreSQL both tables are locked against writes first. A commit
+    that lands meanwhile has its flush wait on the lock, then diff against
+    the rebuilt CountedAsset rows, so its change is counted exactly once.
+    """
+    deployed_id = deployed_status_id()
+    totals = defaultdict(lambda: [0, 0.0])
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == "postgresql":
+            tables = ", ".join(
+                connection.ops.quote_name(model._meta.db_table) for model in (InventoryCount, CountedAsset)
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {tables} IN EXCLUSIVE MODE")
+        CountedAsset.objects.using(using).all().delete()
+
+        rows = (
+            Asset.objects.using(using)
+            .order_by()
+            .values_list("id", "status_id", "category_id", "current_assignee__department_id", "purchase_price")
+        )
+        batch = []
+        for asset_id, *fields in rows.iterator(chunk_size=RECONCILE_CHUNK_SIZE):
+            state = AssetState(*fields)
+            for counter in asset_counters(state, deployed_id):
+                totals[counter][0] += 1
+                totals[counter][1] += state.purchase_price
+            batch.append(CountedAsset(asset_id=asset_id, **state._asdict()))
+            if len(batch) == RECONCILE_CHUNK_SIZE:
+                CountedAsset.objects.using(using).bulk_create(batch)
+                batch = []
+        CountedAsset.objects.using(using).bulk_create(batch)
+
+        totals[("requests", "pending")][0] = (
+            AssetRequest.objects.using(using).filter(status="pending").order_by().count()
+        )
+        totals[("maintenance", "open")][0] = (
+            MaintenanceRequest.objects.using(using).filter(status__in=OPEN_MAINTENANCE).order_by().count()
+        )
+
+        InventoryCount.objects.using(using).all().delete()
+        InventoryCount.objects.using(using).bulk_create(
+            InventoryCount(dimension=dimension, key=key, count=count, value=value)
+            for (dimension, key), (count, value) in totals.items()
+        )
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from apps.reports.summary import reconcile
+
+
+@shared_task
+def reconcile_inventory_summary():
+    reconcile()
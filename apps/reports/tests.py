@@ -1,3 +1,122 @@
-from django.test import TestCase
+import datetime
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from apps.assets import transitions
+from apps.assets.models import AssetRequest, AssetStatus
+from apps.assets.tests import AssetAPITestCase
+from apps.people.models import Department
+from apps.reports.models import InventoryCount
+from apps.reports.summary import reconcile
 
 # Create your tests here.
+
+
+class InventoryCountTestCase(AssetAPITestCase):
+    """
+    Every write path keeps the counters equal to what reconcile() rebuilds.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.other = self.create_user("other")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.repair = AssetStatus.objects.create(name="out for repair")
+            self.assets = [self.create_asset(index, purchase_price=100.0 * (index + 1)) for index in range(4)]
+        self.assertCountersAgree()
+
+    def counters(self):
+        return sorted(
+            (counter.dimension, counter.key, counter.count, round(counter.value, 2))
+            for counter in InventoryCount.objects.all()
+            if counter.count or counter.value
+        )
+
+    def assertCountersAgree(self):
+        incremental = self.counters()
+        reconcile()
+        self.assertEqual(incremental, self.counters())
+
+    def test_asset_save(self):
+        asset = self.assets[0]
+        asset.purchase_price = 2500.0
+        asset.status = self.repair
+        with self.captureOnCommitCallbacks(execute=True):
+            asset.save()
+        self.assertCountersAgree()
+
+    def test_rolled_back_savepoint(self):
+        asset = self.assets[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            asset.purchase_price = 2500.0
+            asset.save()
+            try:
+                with transaction.atomic():
+                    AssetRequest.objects.create(asset=asset, user=self.other, request_date=datetime.date.today())
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertCountersAgree()
+
+    def test_asset_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assets[1].delete()
+        self.assertCountersAgree()
+
+    def test_transition(self):
+        asset_id = self.assets[0].id
+        with self.captureOnCommitCallbacks(execute=True):
+            transitions.assign(asset_id, self.other.id)
+        self.assertCountersAgree()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transitions.start_repair(asset_id, self.user.id)
+        self.assertCountersAgree()
+
+    def test_bulk_approval(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            requests = [
+                AssetRequest.objects.create(asset=asset, user=self.other, request_date=datetime.date.today())
+                for asset in self.assets[:3]
+            ]
+        self.assertCountersAgree()
+
+        items = [
+            {"asset_request": requests[0].id, "status": "approved"},
+            {"asset_request": requests[1].id, "status": "approved"},
+            {"asset_request": requests[2].id, "status": "rejected"},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/asset-requests/bulk-approval/", {"items": items}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(outcome["success"] for outcome in response.data["info"]))
+        self.assertCountersAgree()
+
+    def test_csv_import(self):
+        upload = SimpleUploadedFile(
+            "assets.csv",
+            (
+                "name,serial_no,tag,category,status,supplier,purchase_date,purchase_price\n"
+                "Laptop 10,SN-10,TAG-10,Laptop,ready-to-deploy,Dell,2024-01-01,1200\n"
+                "Laptop 11,SN-11,TAG-11,Laptop,deployed,,2024-01-01,900\n"
+            ).encode("utf-8"),
+            content_type="text/csv",
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/assets/bulk-import/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["info"]["created"], 2)
+        self.assertCountersAgree()
+
+    def test_department_reassignment(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            transitions.assign(self.assets[0].id, self.other.id)
+            transitions.assign(self.assets[1].id, self.other.id)
+        self.assertCountersAgree()
+
+        self.other.department = Department.objects.create(name="Finance", manager="Manager")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.save()
+        self.assertTrue(InventoryCount.objects.filter(dimension="department", key=str(self.other.department_id)).exists())
+        self.assertCountersAgree()
@@ -0,0 +1,11 @@
+from django.urls import path,include
+from rest_framework.routers import DefaultRouter
+from apps.reports.views import InventorySummaryViewSet
+
+router = DefaultRouter()
+router.register(r'reports/summary', InventorySummaryViewSet, basename='inventory-summary')
+
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
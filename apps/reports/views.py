@@ -1,3 +1,64 @@
-from django.shortcuts import render
+from rest_framework import status, viewsets
+from rest_framework.response import Response
+
+from apps.assets.registry import asset_categories, statuses
+from apps.people.models import Department
+from apps.people.permissions import TokenRequiredPermission
+from apps.reports.models import InventoryCount
+from apps.reports.summary import NO_DEPARTMENT
 
 # Create your views here.
+
+
+class InventorySummaryViewSet(viewsets.ViewSet):
+    """
+    Inventory totals read from the maintained counters, one row per status,
+    category and department rather than one per asset.
+    """
+    permission_classes = [TokenRequiredPermission]
+
+    def breakdown(self, counters, dimension, names):
+        rows = []
+        for key, counter in sorted(counters.get(dimension, {}).items()):
+            if not counter.count:
+                continue
+            rows.append(
+                {
+                    "id": None if key == NO_DEPARTMENT else int(key),
+                    "name": names.get(key),
+                    "count": counter.count,
+                    "purchase_price": counter.value,
+                }
+            )
+        return rows
+
+    def list(self, request, *args, **kwargs):
+        counters = {}
+        for counter in InventoryCount.objects.all():
+            counters.setdefault(counter.dimension, {})[counter.key] = counter
+
+        department_ids = [key for key in counters.get("department", {}) if key != NO_DEPARTMENT]
+        departments = {
+            str(pk): name
+            for pk, name in Department.objects.filter(id__in=department_ids).values_list("id", "name")
+        }
+        departments[NO_DEPARTMENT] = "Unassigned"
+
+        def total(dimension, key):
+            counter = counters.get(dimension, {}).get(key)
+            return {"count": counter.count if counter else 0, "purchase_price": counter.value if counter else 0.0}
+
+        data = {
+            "assets": total("assets", "total"),
+            "deployed": total("assets", "deployed"),
+            "by_status": self.breakdown(
+                counters, "status", {str(row.id): row.name for row in statuses.all()}
+            ),
+            "by_category": self.breakdown(
+                counters, "category", {str(row.id): row.name for row in asset_categories.all()}
+            ),
+            "by_department": self.breakdown(counters, "department", departments),
+            "pending_requests": total("requests", "pending")["count"],
+            "open_maintenance": total("maintenance", "open")["count"],
+        }
+        return Response({"success": True, "info": data}, status=status.HTTP_200_OK)
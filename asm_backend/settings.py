@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
+from celery.schedules import crontab
 from decouple import config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,9 +44,13 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # django apps
+    "apps.core",
     "apps.people",
     "apps.assets",
+    "apps.notifications",
+    "apps.reports",
     # third party apps
     "rest_framework",
     "corsheaders",
@@ -147,12 +152,17 @@ STATIC_URL = "static/"
 
 AUTH_USER_MODEL = "people.User"
 
+# Maximum number of nested assets/requests embedded per user in /api/users/
+USER_NESTED_ASSETS_LIMIT = config("USER_NESTED_ASSETS_LIMIT", default=10, cast=int)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
+        "apps.people.authentication.JWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
 
 
@@ -180,6 +190,16 @@ EMAIL_BACKEND = config("EMAIL_BACKEND")
 CELERY_BROKER_URL = config("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND")
 CELERY_TIME_ZONE = config("CELERY_TIME_ZONE")
+CELERY_BEAT_SCHEDULE = {
+    "maintain-history-partitions": {
+        "task": "apps.assets.tasks.maintain_history_partitions",
+        "schedule": crontab(hour=1, minute=0),
+    },
+    "reconcile-inventory-summary": {
+        "task": "apps.reports.tasks.reconcile_inventory_summary",
+        "schedule": crontab(hour=2, minute=0),
+    },
+}
 
 
 # LOGGING = {